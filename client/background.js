@@ -46,8 +46,36 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
         });
         return true;
     }
+    if (request.type === 'STREAM_CAPTIONS') {
+        // Sent from here rather than the content script: requests from youtube.com
+        // would need CORS, the extension has a host permission for the server
+        streamCaptions(request.url, request.text, request.final).then(sendResponse);
+        return true;
+    }
 });
 
+// Forward a caption capture to the fact check server's transcript buffer
+async function streamCaptions(url, text, final) {
+    try {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                text: text,
+                final: final
+            })
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return { status: 'success', data: await response.json() };
+    } catch (error) {
+        return { status: 'error', message: error.message || 'An unknown error occurred' };
+    }
+}
+
 // Updated function to perform fact-checking using API key
 async function performFactCheck(statement) {
     try {
@@ -14,6 +14,8 @@ let isFactCheckPending = false;
 const MIN_REQUEST_INTERVAL = 2000; // 5 seconds
 const MAX_WORD_COUNT = 30;
 const POPUP_DURATION = 8000; // 8 seconds for popup display
+// Captions are also streamed to the fact check server, which picks out the claims to check
+const CAPTION_SESSION_URL = `http://localhost:8004/captions/${crypto.randomUUID()}`;
 
 // Helper function to count words
 function countWords(text) {
@@ -29,40 +31,31 @@ function trimToMaxWords(text) {
     return words.slice(-(MAX_WORD_COUNT)).join(' ');
 }
 
-// Function to send result.text to the backend server via POST
-function sendToBackend(claimText) {
-    const backendURL = 'http://localhost:8004/check';
-    fetch(backendURL, {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json',
-        },
-        body: claimText  // Changed from 'claimText' to 'statement' to match your backend
-    
-    }).then(response => {
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+// Send a caption capture to the server-side transcript buffer. Overlap with earlier
+// captures is fine: the server only checks newly completed claim spans.
+function streamCaptions(text, final = false) {
+    chrome.runtime.sendMessage({ type: 'STREAM_CAPTIONS', url: CAPTION_SESSION_URL, text: text, final: final }, (response) => {
+        if (chrome.runtime.lastError || !response) {
+            console.error('❌ Error streaming captions to backend:', chrome.runtime.lastError);
+            return;
+        }
+        if (response.status !== 'success') {
+            console.error('❌ Error streaming captions to backend:', response.message);
+            return;
+        }
+        if (response.data.spans.length > 0) {
+            console.log('✅ Claims queued for checking:', response.data.spans);
         }
-        return response.json();
-    })
-    .then(data => {
-        console.log('✅ Sent claim to backend successfully:', data);
-    })
-    .catch(error => {
-        console.error('❌ Error sending claim to backend:', error);
-        console.error('Request details:', {
-            url: backendURL,
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                statement: claimText
-            })
-        });
     });
 }
 
+// Flush the last words of the transcript when leaving the page. A beacon outlives
+// the page and, sent as text/plain, needs no CORS preflight.
+window.addEventListener('pagehide', () => {
+    const body = new Blob([JSON.stringify({ text: '', final: true })], { type: 'text/plain' });
+    navigator.sendBeacon(CAPTION_SESSION_URL, body);
+});
+
 // Function to perform fact check
 function performFactCheck(text) {
     isFactCheckPending = true;
@@ -171,6 +164,7 @@ setInterval(() => {
     
     // Store new captions while waiting
     if (newCaption) {
+        streamCaptions(newCaption);
         pendingCaptions += ' ' + newCaption;
         pendingCaptions = pendingCaptions.trim();
         console.log('📝 New caption captured:', {
@@ -212,7 +206,6 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
 
         if (message.data.status === 'success' && message.data.claimReview && message.data.claimReview.length > 0) {
             showFactCheckPopup(message.data);
-            sendToBackend(message.data.text); // Send to backend
 
             accumulatedCaptions = ''; // Reset only when a fact is found
             pendingCaptions = ''; // Clear any pending captions
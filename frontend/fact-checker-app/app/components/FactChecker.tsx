@@ -76,6 +76,57 @@ function getStatusColor(status: FactCheckStatus) {
   }
 }
 
+const JOB_POLL_INTERVAL = 1000
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
+// Submit an interactive fact check job and poll until it finishes
+async function runFactCheckJob(statement: string) {
+  let response = await fetch('http://localhost:8004/jobs', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      statement,
+      priority: 'interactive'
+    })
+  })
+  // Queue is full: wait as long as the server suggests, then try once more
+  if (response.status === 429) {
+    await sleep(Number(response.headers.get('Retry-After') || 5) * 1000)
+    response = await fetch('http://localhost:8004/jobs', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        statement,
+        priority: 'interactive'
+      })
+    })
+  }
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`)
+  }
+  const { job_id } = await response.json()
+
+  while (true) {
+    await sleep(JOB_POLL_INTERVAL)
+    const jobResponse = await fetch(`http://localhost:8004/jobs/${job_id}`)
+    if (!jobResponse.ok) {
+      throw new Error(`HTTP error! status: ${jobResponse.status}`)
+    }
+    const job = await jobResponse.json()
+    if (job.status === 'done') {
+      return job.result
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error)
+    }
+  }
+}
+
 export default function FactChecker() {
   const [factChecks, setFactChecks] = useState<FactCheck[]>(initialFactChecks)
   const [inputText, setInputText] = useState<string>("")
@@ -89,16 +140,7 @@ export default function FactChecker() {
       setIsLoading(true)
       
       try {
-        const response = await fetch('http://localhost:8004/check', {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            statement
-          })
-        })
-        const data = await response.json()
+        const data = await runFactCheckJob(statement)
         console.log('Response data:', data); // Debug log
 
         // Create a new fact check object from the response
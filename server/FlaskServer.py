@@ -1,37 +1,62 @@
-import whisper
+import atexit
+import os
 import torch
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import numpy as np
-import ffmpeg
-import io
+from audio_ingest import AudioIngest
+from transcription_sessions import TranscriptionSessions
+from model_backends import load_whisper, make_whisper_worker
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS to allow cross-origin requests
 
+# Inference backend: torch (default), int8 or faster-whisper; the last two are for CPU-only hosts
+WHISPER_BACKEND = os.environ.get("WHISPER_BACKEND", "torch")
+# Language of the audio (e.g. "en"); unset, it is detected for every 30 s window
+WHISPER_LANGUAGE = os.environ.get("WHISPER_LANGUAGE") or None
+
 # Load Whisper model (use GPU if available)
 device = "cuda" if torch.cuda.is_available() else "cpu"
-model = whisper.load_model("base").to(device)
+model = load_whisper("base", WHISPER_BACKEND, device)
+# With the openai-whisper backends all inference goes through one worker thread that batches concurrent requests
+worker = make_whisper_worker(model, WHISPER_BACKEND, fp16=device == "cuda", language=WHISPER_LANGUAGE)
+
+# WAV and raw PCM are decoded in process, other formats by pre-started ffmpeg workers
+ingest = AudioIngest()
+# Flask has no shutdown hook; don't leave the waiting ffmpeg workers behind
+atexit.register(ingest.close)
 
-def load_audio(file: bytes, sr: int = 16000) -> np.ndarray:
+def load_audio(file: bytes, content_type: str = None, raw_pcm: bool = False) -> np.ndarray:
     """
     Load an audio file and convert it to a NumPy array in 16kHz mono.
     """
     try:
-        # Use ffmpeg to decode audio bytes to a NumPy array
-        out, _ = (
-            ffmpeg.input('pipe:0')
-            .output('pipe:1', format='wav', acodec='pcm_s16le', ac=1, ar=sr)
-            .run(input=file, capture_stdout=True, capture_stderr=True)
-        )
-        
-        # Convert the output to a NumPy array
-        audio = np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
-        return audio
-    except ffmpeg.Error as e:
-        print(f"Error decoding audio: {e.stderr}")
+        return ingest.decode(file, content_type, raw_pcm)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error decoding audio: {e}")
         raise
 
+def transcribe_segment(audio: np.ndarray, prompt: str) -> str:
+    # The prompt carries the end of the transcript so far across segment boundaries
+    return worker.transcribe(audio, prompt)
+
+
+# Live streams, each with its own rolling audio buffer
+sessions = TranscriptionSessions(transcribe_segment)
+
+
+def read_stream_audio() -> np.ndarray:
+    """Audio of a streaming request: an 'audio' file in any format, or a raw body.
+
+    A raw body is 16 kHz mono s16le PCM unless it starts with the header of an audio
+    format (WAV, MP3, Ogg, WebM, ...), so clients can also post encoded chunks. Send
+    PCM as audio/L16 to skip that check.
+    """
+    if 'audio' in request.files:
+        return load_audio(request.files['audio'].read(), request.files['audio'].mimetype)
+    return load_audio(request.get_data(), request.content_type, raw_pcm=True)
+
 # Route to transcribe live audio
 @app.route("/transcribe", methods=["POST"])
 def transcribe_audio():
@@ -42,12 +67,11 @@ def transcribe_audio():
 
     try:
         # Convert raw audio data to NumPy array using the helper function
-        audio_data = load_audio(audio_file)
+        audio_data = load_audio(audio_file, request.files['audio'].mimetype)
 
         # Transcribe the audio using Whisper
         print("Transcribing audio...")
-        result = model.transcribe(audio_data)
-        transcription = result['text']
+        transcription = worker.transcribe(audio_data)
         print("Transcription complete:", transcription)
 
         return jsonify({"text": transcription})
@@ -56,5 +80,46 @@ def transcribe_audio():
         print(f"Error during transcription: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# Routes to transcribe a live stream chunk by chunk
+@app.route("/transcribe/stream/<session_id>", methods=["POST"])
+def transcribe_stream(session_id):
+    """Append audio to a session and return the text of the segments it completed.
+
+    Text is only returned once a pause (or the segment length cap) closes a segment,
+    so each piece of audio is transcribed exactly once. Pass ?final=1 on the last
+    chunk to flush what is left.
+    """
+    final = request.args.get('final', '0') in ('1', 'true')
+    try:
+        audio_data = read_stream_audio()
+        session = sessions.get(session_id)
+        with session.lock:
+            texts = session.append(audio_data, final=final)
+            stats = session.stats()
+        if final:
+            sessions.pop(session_id)
+        return jsonify({"text": " ".join(texts), "segments": texts, **stats})
+
+    except Exception as e:
+        print(f"Error during streaming transcription: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@app.route("/transcribe/stream/<session_id>", methods=["DELETE"])
+def close_stream(session_id):
+    session = sessions.pop(session_id)
+    if session is None:
+        return jsonify({"status": "error", "message": "Unknown session."}), 404
+    with session.lock:
+        texts = session.append(np.zeros(0, dtype=np.float32), final=True)
+        return jsonify({"text": " ".join(texts), "segments": texts, "transcript": session.transcript,
+                        **session.stats()})
+
+
+@app.route("/transcribe/stats", methods=["GET"])
+def transcribe_stats():
+    return jsonify({"sessions": sessions.stats(), "ingest": ingest.stats(),
+                    "inference": {"backend": WHISPER_BACKEND, "language": WHISPER_LANGUAGE, **worker.stats()}})
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,231 @@
+import queue
+import struct
+import subprocess
+import threading
+import time
+from math import gcd
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.signal import resample_poly
+
+SAMPLE_RATE = 16000
+# Content types that declare headerless 16 kHz mono s16le audio
+RAW_PCM_TYPES = {"audio/l16", "audio/pcm"}
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def pcm16_to_float(data) -> np.ndarray:
+    """s16le bytes to float32 in [-1, 1) with a single copy (the dtype conversion)."""
+    audio = np.frombuffer(data, dtype='<i2', count=len(data) // 2).astype(np.float32)
+    audio *= 1 / 32768.0
+    return audio
+
+
+def sniff_container(data: bytes) -> Optional[str]:
+    """Name of the audio container or stream format `data` starts with, or None if it has no known header."""
+    if data[:4] == b"RIFF":
+        return "wav"
+    if data[:4] == b"OggS":
+        return "ogg"
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if data[:4] == b"fLaC":
+        return "flac"
+    if data[4:8] == b"ftyp":
+        return "mp4"
+    if data[:3] == b"ID3":
+        return "mp3"
+    if len(data) >= 3 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0:
+        # MPEG audio frame sync (0xFFFx); the header fields must be valid too, so quiet
+        # PCM (runs of 0xFF bytes) is not mistaken for it
+        version, layer = (data[1] >> 3) & 3, (data[1] >> 1) & 3
+        if data[1] & 0xF6 == 0xF0 and (data[2] >> 2) & 0xF < 13:
+            return "aac"
+        if version != 1 and layer != 0 and data[2] >> 4 != 15 and (data[2] >> 2) & 3 != 3:
+            return "mp3"
+    return None
+
+
+def parse_wav(data: bytes) -> Optional[np.ndarray]:
+    """Decode a PCM or float WAV to 16 kHz mono float32, or None if it is not one we can read.
+
+    Samples are viewed in place with np.frombuffer; the only copies are the float
+    conversion and, when needed, the channel mix-down and resampling.
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    view = memoryview(data)
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        size = struct.unpack_from("<I", data, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            if body + 16 > len(data):
+                return None
+            fmt = struct.unpack_from("<HHIIHH", data, body)
+            if fmt[0] == WAVE_FORMAT_EXTENSIBLE and size >= 26 and body + 26 <= len(data):
+                # The real format tag is the first field of the sub-format GUID
+                fmt = (struct.unpack_from("<H", data, body + 24)[0],) + fmt[1:]
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            # Streamed WAVs often carry a placeholder size; take what is there
+            samples = view[body:min(body + size, len(data))]
+            break
+        offset = body + size + (size & 1)
+    else:
+        return None
+
+    format_tag, channels, sample_rate, _, _, bits = fmt
+    if format_tag == WAVE_FORMAT_PCM and bits == 16:
+        audio = pcm16_to_float(samples)
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        audio = np.frombuffer(samples, dtype='<f4', count=len(samples) // 4)
+    else:
+        return None
+    if channels > 1:
+        audio = audio[:len(audio) - len(audio) % channels].reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    if sample_rate != SAMPLE_RATE:
+        factor = gcd(sample_rate, SAMPLE_RATE)
+        audio = resample_poly(audio, SAMPLE_RATE // factor, sample_rate // factor).astype(np.float32, copy=False)
+    return audio
+
+
+class FfmpegPool:
+    """Pre-started ffmpeg decoders for compressed uploads.
+
+    An ffmpeg process decodes exactly one stdin stream, so processes can't be reused;
+    instead `size` of them are kept started and waiting on stdin, and a used one is
+    replaced from a background thread. Requests then only pay for the decode itself,
+    not for spawning and initializing ffmpeg.
+    """
+
+    def __init__(self, size: int = 2, ffmpeg: str = "ffmpeg"):
+        self.command = [
+            ffmpeg, "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+            "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"
+        ]
+        self._ready: "queue.Queue[subprocess.Popen]" = queue.Queue()
+        self.spawns = 0
+        self.spawn_time = 0.0
+        self.cold_starts = 0
+        self._closed = False
+        for _ in range(size):
+            self._ready.put(self._spawn())
+
+    def _spawn(self) -> subprocess.Popen:
+        started_at = time.perf_counter()
+        process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+        self.spawn_time += time.perf_counter() - started_at
+        self.spawns += 1
+        return process
+
+    def _replace(self):
+        if self._closed:
+            return
+        self._ready.put(self._spawn())
+        if self._closed:
+            # Closed while this one was starting
+            self.close()
+
+    def decode(self, data: bytes) -> np.ndarray:
+        try:
+            process = self._ready.get_nowait()
+        except queue.Empty:
+            # More concurrent decodes than warm processes
+            self.cold_starts += 1
+            process = self._spawn()
+        else:
+            threading.Thread(target=self._replace, daemon=True).start()
+        out, err = process.communicate(input=data)
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg could not decode audio: {err.decode(errors='replace').strip()}")
+        return pcm16_to_float(out)
+
+    def close(self):
+        """Kill the waiting processes; decodes started afterwards spawn ffmpeg cold."""
+        self._closed = True
+        while True:
+            try:
+                process = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            process.kill()
+            process.wait()
+
+    def stats(self) -> Dict:
+        return {
+            "spawns": self.spawns,
+            "cold_starts": self.cold_starts,
+            "mean_spawn_ms": 1000 * self.spawn_time / self.spawns if self.spawns else 0.0
+        }
+
+
+class AudioIngest:
+    """Turns uploaded audio into 16 kHz mono float32 samples for Whisper.
+
+    WAV uploads (16-bit PCM or 32-bit float, any rate and channel count) and raw
+    s16le PCM are decoded in process; everything else goes to the ffmpeg pool. Audio
+    is only taken as raw PCM when its content type is one of RAW_PCM_TYPES, or, with
+    `raw_pcm`, when it has no container header: an untyped upload
+    (application/octet-stream) is as likely to be MP3 or WebM. Decode latency is
+    recorded per path.
+    """
+
+    def __init__(self, ffmpeg_workers: int = 2, ffmpeg: str = "ffmpeg"):
+        self.ffmpeg = None
+        if ffmpeg_workers:
+            try:
+                self.ffmpeg = FfmpegPool(ffmpeg_workers, ffmpeg)
+            except FileNotFoundError:
+                print(f"{ffmpeg} not found, only WAV and raw PCM audio can be decoded")
+        self._lock = threading.Lock()
+        self._timings: Dict[str, Dict] = {}
+
+    def _record(self, path: str, seconds: float, audio_seconds: float):
+        with self._lock:
+            timing = self._timings.setdefault(path, {"requests": 0, "decode_seconds": 0.0,
+                                                     "max_decode_seconds": 0.0, "audio_seconds": 0.0})
+            timing["requests"] += 1
+            timing["decode_seconds"] += seconds
+            timing["max_decode_seconds"] = max(timing["max_decode_seconds"], seconds)
+            timing["audio_seconds"] += audio_seconds
+
+    def decode(self, data: bytes, content_type: Optional[str] = None, raw_pcm: bool = False) -> np.ndarray:
+        """Decode an upload; `raw_pcm` takes audio without a known header as s16le PCM."""
+        started_at = time.perf_counter()
+        audio = parse_wav(data)
+        path = "wav"
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        if audio is None and (media_type in RAW_PCM_TYPES or (raw_pcm and sniff_container(data) is None)):
+            audio = pcm16_to_float(data)
+            path = "pcm"
+        if audio is None:
+            if self.ffmpeg is None:
+                raise ValueError("Unsupported audio format and ffmpeg decoding is disabled")
+            audio = self.ffmpeg.decode(data)
+            path = "ffmpeg"
+        self._record(path, time.perf_counter() - started_at, len(audio) / SAMPLE_RATE)
+        return audio
+
+    def close(self):
+        if self.ffmpeg is not None:
+            self.ffmpeg.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            paths = {
+                path: {
+                    **timing,
+                    "mean_decode_ms": 1000 * timing["decode_seconds"] / timing["requests"]
+                }
+                for path, timing in self._timings.items()
+            }
+        return {"paths": paths, "ffmpeg_pool": self.ffmpeg.stats() if self.ffmpeg else None}
@@ -0,0 +1,109 @@
+"""Decode latency and process-spawn overhead of audio ingestion, before and after.
+
+Usage:
+    python benchmarks/bench_audio_ingest.py [--seconds 5] [--repeat 20] [--ffmpeg ffmpeg]
+
+Generates test clips (16 kHz mono WAV, 44.1 kHz stereo WAV, raw PCM and, when ffmpeg
+is available, an Ogg/Opus file) and decodes each one `--repeat` times with:
+
+  legacy   a new ffmpeg process per request, as load_audio() used to do
+  ingest   AudioIngest: WAV/PCM in process, other formats via pre-started ffmpeg
+"""
+import argparse
+import io
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audio_ingest import SAMPLE_RATE, AudioIngest  # noqa: E402
+
+
+def make_wav(seconds, sample_rate, channels):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.01 * np.random.default_rng(0).standard_normal(len(t))
+    samples = (np.repeat(tone[:, None], channels, axis=1) * 32767).astype('<i2')
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def legacy_decode(ffmpeg, data):
+    """The old load_audio: spawn ffmpeg, read WAV from stdout, convert with three copies."""
+    spawn_started = time.perf_counter()
+    process = subprocess.Popen(
+        [ffmpeg, "-i", "pipe:0", "-f", "wav", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    spawn_time = time.perf_counter() - spawn_started
+    out, _ = process.communicate(input=data)
+    audio = np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+    return audio, spawn_time
+
+
+def report(label, timings, spawn_times=None):
+    line = (f"  {label:28s} mean {1000 * statistics.mean(timings):8.2f} ms, "
+            f"p95 {1000 * sorted(timings)[int(0.95 * (len(timings) - 1))]:8.2f} ms")
+    if spawn_times:
+        line += f", spawn {1000 * statistics.mean(spawn_times):6.2f} ms/request"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--ffmpeg", default="ffmpeg")
+    args = parser.parse_args()
+
+    have_ffmpeg = shutil.which(args.ffmpeg) is not None
+    wav_16k = make_wav(args.seconds, SAMPLE_RATE, 1)
+    clips = {
+        "wav 16k mono": (wav_16k, "audio/wav"),
+        "wav 44.1k stereo": (make_wav(args.seconds, 44100, 2), "audio/wav"),
+        "raw pcm": (wav_16k[44:], "audio/L16")
+    }
+    if have_ffmpeg:
+        ogg = subprocess.run([args.ffmpeg, "-loglevel", "error", "-i", "pipe:0", "-c:a", "libopus", "-f", "ogg", "pipe:1"],
+                             input=wav_16k, capture_output=True, check=True).stdout
+        clips["ogg/opus"] = (ogg, "audio/ogg")
+    else:
+        print(f"{args.ffmpeg} not found: skipping the legacy path and compressed formats")
+
+    ingest = AudioIngest(ffmpeg=args.ffmpeg, ffmpeg_workers=2 if have_ffmpeg else 0)
+    print(f"{args.seconds:.0f} s clips, {args.repeat} decodes each")
+    for name, (data, content_type) in clips.items():
+        print(f"\n{name} ({len(data) / 1024:.0f} KiB)")
+        if have_ffmpeg and name != "raw pcm":
+            timings, spawns = [], []
+            for _ in range(args.repeat):
+                started_at = time.perf_counter()
+                _, spawn_time = legacy_decode(args.ffmpeg, data)
+                timings.append(time.perf_counter() - started_at)
+                spawns.append(spawn_time)
+            report("legacy (ffmpeg per request)", timings, spawns)
+        timings = []
+        for _ in range(args.repeat):
+            started_at = time.perf_counter()
+            ingest.decode(data, content_type)
+            timings.append(time.perf_counter() - started_at)
+            # Give the pool time to replace the used process, as between real requests
+            time.sleep(0.05 if name == "ogg/opus" else 0)
+        report("ingest", timings)
+    print(f"\nIngest stats: {ingest.stats()}")
+    ingest.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Latency, throughput, memory and output agreement of the CPU model backends.
+
+Usage:
+    python benchmarks/bench_backends.py minilm [--backends torch,int8,onnx,onnx-int8] [--repeat 50]
+    python benchmarks/bench_backends.py whisper --audio a.wav b.wav [--backends torch,int8,faster-whisper]
+                                        [--concurrency 4]
+
+Each backend is loaded in its own process so resident memory is measured in
+isolation. The first backend in --backends is the reference for agreement:
+
+  minilm   cosine similarity of each embedding to the reference, and how often the
+           nearest neighbour of a sentence (what evidence ranking relies on) matches
+  whisper  word error rate of each transcript against the reference transcript
+
+Sentences are the check-worthiness seed sets. Whisper clips are WAV files, 16-bit
+PCM or float, any rate; all clips are sent at once by --concurrency client threads
+for the throughput figure. Run with the same thread settings as the servers
+(e.g. OMP_NUM_THREADS) for figures that carry over.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from model_backends import SENTENCE_BACKENDS, WHISPER_BACKENDS  # noqa: E402
+
+
+def rss_mb():
+    """Current resident set size of this process (Linux)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))]
+
+
+def word_error_rate(reference, hypothesis):
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref:
+        return float(bool(hyp))
+    distances = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        previous, distances[0] = distances[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            previous, distances[j] = distances[j], min(distances[j] + 1, distances[j - 1] + 1,
+                                                       previous + (ref_word != hyp_word))
+    return distances[-1] / len(ref)
+
+
+def run_minilm(backend, args, out_dir):
+    from check_worthiness import CLAIMS, NON_CLAIMS
+    from model_backends import load_sentence_transformer
+
+    sentences = CLAIMS + NON_CLAIMS
+    memory_before = rss_mb()
+    started_at = time.perf_counter()
+    model = load_sentence_transformer(backend=backend)
+    load_seconds = time.perf_counter() - started_at
+    model.encode(sentences[:8], show_progress_bar=False)  # warm-up
+
+    latencies = []
+    for i in range(args.repeat):
+        started_at = time.perf_counter()
+        model.encode([sentences[i % len(sentences)]], show_progress_bar=False)
+        latencies.append(time.perf_counter() - started_at)
+
+    batch = (sentences * (args.batch_size // len(sentences) + 1))[:args.batch_size]
+    started_at = time.perf_counter()
+    for _ in range(args.batches):
+        model.encode(batch, batch_size=len(batch), show_progress_bar=False)
+    throughput = args.batches * len(batch) / (time.perf_counter() - started_at)
+
+    embeddings = model.encode(sentences, show_progress_bar=False, normalize_embeddings=True)
+    np.save(os.path.join(out_dir, f"{backend}.npy"), np.asarray(embeddings, dtype=np.float32))
+    return {
+        "load_s": load_seconds,
+        "memory_mb": rss_mb() - memory_before,
+        "mean_ms": 1000 * statistics.mean(latencies),
+        "p95_ms": 1000 * percentile(latencies, 0.95),
+        "throughput": throughput
+    }
+
+
+def run_whisper(backend, args, out_dir):
+    from audio_ingest import SAMPLE_RATE, parse_wav
+    from model_backends import load_whisper, make_whisper_worker
+
+    clips = []
+    for path in args.audio:
+        with open(path, "rb") as f:
+            audio = parse_wav(f.read())
+        if audio is None:
+            raise SystemExit(f"{path}: not a 16-bit PCM or float WAV file")
+        clips.append(audio)
+    audio_seconds = sum(len(clip) for clip in clips) / SAMPLE_RATE
+
+    memory_before = rss_mb()
+    started_at = time.perf_counter()
+    worker = make_whisper_worker(load_whisper(args.model, backend), backend)
+    load_seconds = time.perf_counter() - started_at
+    worker.transcribe(clips[0][:SAMPLE_RATE])  # warm-up
+
+    texts, latencies = [], []
+    for clip in clips:
+        started_at = time.perf_counter()
+        texts.append(worker.transcribe(clip))
+        latencies.append(time.perf_counter() - started_at)
+
+    requests = clips * args.concurrency
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(worker.transcribe, requests))
+    concurrent_seconds = time.perf_counter() - started_at
+
+    with open(os.path.join(out_dir, f"{backend}.json"), "w") as f:
+        json.dump(texts, f)
+    return {
+        "load_s": load_seconds,
+        "memory_mb": rss_mb() - memory_before,
+        "mean_ms": 1000 * statistics.mean(latencies),
+        "p95_ms": 1000 * percentile(latencies, 0.95),
+        "real_time_factor": sum(latencies) / audio_seconds,
+        "throughput": audio_seconds * args.concurrency / concurrent_seconds
+    }
+
+
+def agreement(kind, reference, backend, out_dir):
+    if kind == "minilm":
+        expected = np.load(os.path.join(out_dir, f"{reference}.npy"))
+        actual = np.load(os.path.join(out_dir, f"{backend}.npy"))
+        cosines = np.sum(expected * actual, axis=1)
+        # Nearest other sentence under each backend
+        neighbours = []
+        for embeddings in (expected, actual):
+            similarity = embeddings @ embeddings.T
+            np.fill_diagonal(similarity, -np.inf)
+            neighbours.append(similarity.argmax(axis=1))
+        return (f"cosine mean {cosines.mean():.4f} min {cosines.min():.4f}, "
+                f"same nearest neighbour {np.mean(neighbours[0] == neighbours[1]):.0%}")
+    with open(os.path.join(out_dir, f"{reference}.json")) as f:
+        expected = json.load(f)
+    with open(os.path.join(out_dir, f"{backend}.json")) as f:
+        actual = json.load(f)
+    rates = [word_error_rate(e, a) for e, a in zip(expected, actual)]
+    return f"WER mean {statistics.mean(rates):.1%} max {max(rates):.1%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=["minilm", "whisper"])
+    parser.add_argument("--backends", help="comma-separated, reference first (default: all)")
+    parser.add_argument("--repeat", type=int, default=50, help="single-sentence encodes for latency")
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--audio", nargs="+", default=[])
+    parser.add_argument("--model", default="base", help="Whisper model size")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--out-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run = run_minilm if args.kind == "minilm" else run_whisper
+        print(json.dumps(run(args.child, args, args.out_dir)))
+        return
+
+    if args.kind == "whisper" and not args.audio:
+        parser.error("whisper needs --audio files")
+    available = SENTENCE_BACKENDS if args.kind == "minilm" else WHISPER_BACKENDS
+    backends = args.backends.split(",") if args.backends else list(available)
+    unit = "sentences/s" if args.kind == "minilm" else "audio s/s"
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        done = []
+        for backend in backends:
+            child = subprocess.run([sys.executable, os.path.abspath(__file__), *sys.argv[1:], "--child", backend,
+                                    "--out-dir", out_dir], capture_output=True, text=True)
+            if child.returncode != 0:
+                error = (child.stderr.strip().splitlines() or ["failed"])[-1]
+                print(f"\n{backend}: {error}")
+                continue
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            print(f"\n{backend}")
+            print(f"  load {result['load_s']:.1f} s, memory +{result['memory_mb']:.0f} MiB")
+            line = f"  latency mean {result['mean_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms"
+            if "real_time_factor" in result:
+                line += f", real-time factor {result['real_time_factor']:.2f}"
+            print(line)
+            print(f"  throughput {result['throughput']:.1f} {unit}")
+            if done:
+                print(f"  vs {done[0]}: {agreement(args.kind, done[0], backend, out_dir)}")
+            done.append(backend)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare the lxml extractor with the old BeautifulSoup one on saved pages.
+
+Usage:
+    python benchmarks/bench_extract.py --save CORPUS_DIR URL [URL ...]   # build a corpus
+    python benchmarks/bench_extract.py CORPUS_DIR [--repeat 5] [--max-bytes 1048576]
+
+Every *.html file in CORPUS_DIR is extracted with both engines, on the full page and on
+the first --max-bytes bytes (what the server downloads). Reports time per page, peak
+Python memory per extraction, and how often the outputs agree.
+"""
+import argparse
+import difflib
+import glob
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from html_extract import extract_text, extract_text_bs4  # noqa: E402
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def save_pages(corpus_dir, urls):
+    import requests
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    for i, url in enumerate(urls):
+        try:
+            response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=10)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Skipping {url}: {e}")
+            continue
+        path = os.path.join(corpus_dir, f"page_{i:03d}.html")
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"Saved {url} -> {path} ({len(response.content)} bytes)")
+
+
+def time_extractor(extract, pages, repeat):
+    timings = []
+    for _ in range(repeat):
+        for html in pages:
+            started_at = time.perf_counter()
+            extract(html)
+            timings.append(time.perf_counter() - started_at)
+    return timings
+
+
+def peak_memory(extract, pages):
+    peaks = []
+    for html in pages:
+        tracemalloc.start()
+        extract(html)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peaks
+
+
+def agreement(pages):
+    exact = 0
+    ratios = []
+    for html in pages:
+        a, b = extract_text(html), extract_text_bs4(html)
+        exact += a == b
+        ratios.append(difflib.SequenceMatcher(None, a, b, autojunk=False).ratio())
+    return exact, ratios
+
+
+def report(label, pages, repeat):
+    total_bytes = sum(len(html.encode('utf-8')) for html in pages)
+    print(f"\n{label}: {len(pages)} pages, {total_bytes / 1024:.0f} KiB total")
+    results = {}
+    for name, extract in (("lxml", extract_text), ("bs4", extract_text_bs4)):
+        timings = time_extractor(extract, pages, repeat)
+        peaks = peak_memory(extract, pages)
+        results[name] = sum(timings)
+        print(f"  {name:5s} mean {1000 * statistics.mean(timings):7.2f} ms/page, "
+              f"p95 {1000 * sorted(timings)[int(0.95 * (len(timings) - 1))]:7.2f} ms, "
+              f"{total_bytes * repeat / sum(timings) / 1e6:6.1f} MB/s, "
+              f"peak mem mean {statistics.mean(peaks) / 1e6:6.1f} MB, max {max(peaks) / 1e6:6.1f} MB")
+    print(f"  speedup {results['bs4'] / results['lxml']:.1f}x")
+    exact, ratios = agreement(pages)
+    print(f"  identical output on {exact}/{len(pages)} pages, "
+          f"mean similarity {statistics.mean(ratios):.4f}, min {min(ratios):.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus_dir")
+    parser.add_argument("urls", nargs="*")
+    parser.add_argument("--save", action="store_true", help="download URLS into CORPUS_DIR and exit")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024)
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages(args.corpus_dir, args.urls)
+        return
+
+    raw_pages = []
+    for path in sorted(glob.glob(os.path.join(args.corpus_dir, "*.html"))):
+        with open(path, "rb") as f:
+            raw_pages.append(f.read())
+    if not raw_pages:
+        sys.exit(f"No .html files in {args.corpus_dir}")
+
+    report("Full pages", [raw.decode('utf-8', errors='replace') for raw in raw_pages], args.repeat)
+    report(f"First {args.max_bytes} bytes",
+           [raw[:args.max_bytes].decode('utf-8', errors='replace') for raw in raw_pages], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Throughput of the streaming sentence segmenter on the bundled debate transcripts.
+
+Usage:
+    python benchmarks/bench_segmenter.py [--model en_core_web_sm] [--repeat 20] [--batch-size 64]
+
+The transcripts are read (without running the scripts) from sentence_parsing_testing.py
+and sentence_parsing_testing2.py in the repository root. Compares:
+
+  baseline     full pipeline on every caption line, as parse_sentences() did
+  incremental  StreamingSentenceSegmenter.feed() line by line, then flush()
+  bulk         StreamingSentenceSegmenter.segment_many() over whole transcripts
+"""
+import argparse
+import ast
+import os
+import sys
+import time
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, SERVER_DIR)
+
+import spacy  # noqa: E402
+
+from sentence_segmenter import StreamingSentenceSegmenter  # noqa: E402
+
+TRANSCRIPT_FILES = ["sentence_parsing_testing.py", "sentence_parsing_testing2.py"]
+
+
+def load_transcripts():
+    """Every string literal of 20+ words in the test scripts, deduplicated."""
+    transcripts = []
+    for name in TRANSCRIPT_FILES:
+        with open(os.path.join(SERVER_DIR, "..", name), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and len(node.value.split()) >= 20:
+                transcripts.append(node.value)
+    return list(dict.fromkeys(transcripts))
+
+
+def run_baseline(nlp, transcripts):
+    for transcript in transcripts:
+        for line in transcript.splitlines():
+            if line.strip():
+                nlp(line)
+
+
+def run_incremental(segmenter, transcripts):
+    segments = 0
+    for transcript in transcripts:
+        for line in transcript.splitlines():
+            segments += len(segmenter.feed(line))
+        segments += len(segmenter.flush())
+    return segments
+
+
+def run_bulk(segmenter, transcripts, batch_size):
+    return sum(len(segments) for segments in segmenter.segment_many(transcripts, batch_size=batch_size))
+
+
+def timed(label, words, fn):
+    started_at = time.perf_counter()
+    segments = fn()
+    elapsed = time.perf_counter() - started_at
+    extra = f", {segments} segments" if segments is not None else ""
+    print(f"  {label:12s} {elapsed:7.3f} s, {words / elapsed:9.0f} words/s{extra}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--repeat", type=int, default=20, help="times to replay the transcripts")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    transcripts = load_transcripts() * args.repeat
+    words = sum(len(t.split()) for t in transcripts)
+    print(f"{len(transcripts)} transcripts, {words} words")
+
+    full_nlp = spacy.load(args.model)
+    segmenter = StreamingSentenceSegmenter(args.model)
+    print(f"Pipes: full {full_nlp.pipe_names}, segmenter {segmenter.nlp.pipe_names}")
+
+    # Warm up both pipelines so model initialization is not timed
+    run_baseline(full_nlp, transcripts[:1])
+    run_bulk(segmenter, transcripts[:1], args.batch_size)
+
+    baseline = timed("baseline", words, lambda: run_baseline(full_nlp, transcripts))
+    incremental = timed("incremental", words, lambda: run_incremental(segmenter, transcripts))
+    bulk = timed("bulk", words, lambda: run_bulk(segmenter, transcripts, args.batch_size))
+    print(f"  speedup vs baseline: incremental {baseline / incremental:.1f}x, bulk {baseline / bulk:.1f}x")
+    print(f"  tokens parsed by incremental: {segmenter.tokens_parsed} over {segmenter.chunks} chunks")
+
+
+if __name__ == "__main__":
+    main()
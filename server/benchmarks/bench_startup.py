@@ -0,0 +1,153 @@
+"""Import time and time to serve of the fact-checking server.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 3] [--port 8014] [--timeout 300]
+                                       [--server "duckduckgo ollama server.py"]
+
+For each run, in fresh processes:
+
+  import   time to import the server module, with the slowest top-level imports
+           (from python -X importtime)
+  listen   time from launching the server until /health answers
+  ready    time until /ready reports every component ready, and how long each took
+
+Pass --server a copy of an older version (e.g. from `git show`) to compare
+before and after; a server without /ready is reported as ready once it listens.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+LOAD_SERVER = """
+import importlib.util, os, sys, time
+path = os.path.abspath(sys.argv[1])
+sys.path.insert(0, os.path.dirname(path))
+started_at = time.perf_counter()
+spec = importlib.util.spec_from_file_location("factcheck_server", path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print("IMPORT_SECONDS", time.perf_counter() - started_at, flush=True)
+if len(sys.argv) > 2:
+    import uvicorn
+    uvicorn.run(module.app, host="127.0.0.1", port=int(sys.argv[2]), log_level="warning")
+"""
+
+
+def measure_import(server):
+    child = subprocess.run([sys.executable, "-X", "importtime", "-c", LOAD_SERVER, server],
+                           capture_output=True, text=True)
+    seconds = None
+    for line in child.stdout.splitlines():
+        if line.startswith("IMPORT_SECONDS"):
+            seconds = float(line.split()[1])
+    if seconds is None:
+        raise SystemExit(f"Importing {server} failed:\n{child.stderr[-2000:]}")
+    top_level = []
+    for line in child.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit() and not name.startswith("  "):
+                top_level.append((int(cumulative) / 1e6, name.strip()))
+    return seconds, sorted(top_level, reverse=True)[:8]
+
+
+def get(url):
+    """(status, JSON body or None), or (None, None) if nothing is listening yet."""
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return response.status, json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        try:
+            return e.code, json.loads(body)
+        except ValueError:
+            return e.code, None
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return None, None
+
+
+def measure_startup(server, port, timeout):
+    base = f"http://127.0.0.1:{port}"
+    started_at = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", LOAD_SERVER, server, str(port)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    listen = ready = None
+    components = {}
+    try:
+        while time.perf_counter() - started_at < timeout and process.poll() is None:
+            if listen is None:
+                status, _ = get(base + "/health")
+                if status == 200:
+                    listen = time.perf_counter() - started_at
+            if listen is not None:
+                status, body = get(base + "/ready")
+                if status == 404:
+                    ready = listen
+                    break
+                if body:
+                    components = body.get("components", {})
+                    if status == 200:
+                        ready = time.perf_counter() - started_at
+                        break
+                    if any(c["status"] == "failed" for c in components.values()):
+                        break
+            time.sleep(0.05)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return listen, ready, components
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8014)
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for /ready")
+    parser.add_argument("--server", default=os.path.join(SERVER_DIR, "duckduckgo ollama server.py"))
+    args = parser.parse_args()
+
+    imports, listens, readies = [], [], []
+    for run in range(args.runs):
+        seconds, slowest = measure_import(args.server)
+        imports.append(seconds)
+        listen, ready, components = measure_startup(args.server, args.port, args.timeout)
+        print(f"\nrun {run + 1}: import {seconds:.2f} s, "
+              f"listening after {f'{listen:.2f} s' if listen is not None else 'never'}, "
+              f"ready after {f'{ready:.2f} s' if ready is not None else 'never'}")
+        if run == 0:
+            print("  slowest top-level imports:")
+            for cumulative, name in slowest:
+                print(f"    {cumulative:6.2f} s  {name}")
+        for name, component in components.items():
+            detail = f"{component['status']}"
+            if "seconds" in component:
+                detail += f" in {component['seconds']:.2f} s"
+            if "error" in component:
+                detail += f" ({component['error']})"
+            print(f"  {name:18s} {detail}")
+        if listen is not None:
+            listens.append(listen)
+        if ready is not None:
+            readies.append(ready)
+
+    print(f"\nmedian over {args.runs} runs: import {statistics.median(imports):.2f} s", end="")
+    if listens:
+        print(f", listening {statistics.median(listens):.2f} s", end="")
+    if readies:
+        print(f", ready {statistics.median(readies):.2f} s", end="")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to clients that can't keep up ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# Subscribers of this topic receive every message, whatever its topic
+WILDCARD = "*"
+
+
+class Client:
+    """One WebSocket connection: its outbound queue and the task draining it."""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: Deque[Tuple[str, float, bool]] = deque()  # (text, enqueued at, droppable)
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.topics: Set[str] = set()
+        self.closed = False
+        self.dropped = 0
+
+
+class Topic:
+    """Subscribers of one topic and its most recent messages, for late joiners."""
+
+    def __init__(self, replay_size: int):
+        self.subscribers: Set[Client] = set()
+        self.backlog: Deque[str] = deque(maxlen=replay_size)
+        self.last_active = time.time()
+
+
+class BroadcastHub:
+    """Fans messages out to WebSocket clients without waiting on any of them.
+
+    Each client has a bounded outbound queue drained by its own sender task, so a
+    broadcast only serializes the message once and appends it to every queue; slow
+    or dead connections delay nobody else. When a client's queue holds `max_queue`
+    messages, the oldest droppable one (a partial update superseded by later ones) is
+    discarded to make room. A client whose queue is full of messages that must not be
+    lost, or whose socket takes longer than `send_timeout` to accept a message, is
+    disconnected with close code 1013 so it reconnects instead of falling behind.
+
+    Messages are published under a topic (e.g. a caption or transcript session) and
+    go only to that topic's subscribers and to WILDCARD subscribers, so fan-out cost
+    follows the audience of a stream rather than every connection. The last
+    `replay_size` messages that must not be lost are kept per topic and queued for a
+    client as soon as it subscribes. Topics nobody subscribes to are forgotten after
+    `topic_ttl` seconds without messages, or sooner beyond `max_topics`.
+    """
+
+    def __init__(self, max_queue: int = 64, send_timeout: float = 5.0, close_timeout: float = 1.0,
+                 replay_size: int = 32, max_topics: int = 1000, topic_ttl: float = 3600):
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.close_timeout = close_timeout
+        # Leave room in the queue for live messages after a full backlog
+        self.replay_size = min(replay_size, max_queue // 2)
+        self.max_topics = max_topics
+        self.topic_ttl = topic_ttl
+        self._clients: Set[Client] = set()
+        self._topics: "OrderedDict[str, Topic]" = OrderedDict([(WILDCARD, Topic(self.replay_size))])
+        self.connected = 0
+        self.broadcasts = 0
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.replayed = 0
+        self.peak_queue_depth = 0
+        self.disconnects: Dict[str, int] = {}
+        self._delivery_latencies = deque(maxlen=1000)
+        self._broadcast_times = deque(maxlen=1000)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def connect(self, websocket: WebSocket) -> Client:
+        """Register an accepted WebSocket and start its sender task; it receives nothing until it subscribes."""
+        client = Client(websocket)
+        client.task = asyncio.ensure_future(self._send_loop(client))
+        self._clients.add(client)
+        self.connected += 1
+        return client
+
+    async def disconnect(self, client: Client):
+        """Unregister a client whose connection has ended."""
+        self._remove(client, "closed by client")
+
+    def _topic(self, name: str) -> Topic:
+        topic = self._topics.get(name)
+        if topic is None:
+            topic = self._topics[name] = Topic(self.replay_size)
+        self._topics.move_to_end(name)
+        topic.last_active = time.time()
+        self._prune()
+        return topic
+
+    def _prune(self):
+        cutoff = time.time() - self.topic_ttl
+        for name, topic in list(self._topics.items()):
+            if len(self._topics) <= self.max_topics and topic.last_active >= cutoff:
+                break
+            if name != WILDCARD and not topic.subscribers:
+                del self._topics[name]
+
+    def subscribe(self, client: Client, name: str, replay: bool = True) -> int:
+        """Subscribe a client to a topic and queue the topic's backlog for it; returns the backlog size."""
+        if client.closed:
+            return 0
+        topic = self._topic(name)
+        topic.subscribers.add(client)
+        client.topics.add(name)
+        if not replay:
+            return 0
+        now = time.perf_counter()
+        replayed = 0
+        for text in list(topic.backlog):
+            if not self._enqueue(client, text, now, False):
+                break
+            replayed += 1
+        self.replayed += replayed
+        return replayed
+
+    def unsubscribe(self, client: Client, name: str):
+        topic = self._topics.get(name)
+        if topic is not None:
+            topic.subscribers.discard(client)
+        client.topics.discard(name)
+
+    def send(self, client: Client, message: Dict) -> bool:
+        """Queue a message for one client, behind what is already queued for it."""
+        return not client.closed and self._enqueue(client, json.dumps(message), time.perf_counter(), False)
+
+    def broadcast(self, message: Dict, topic: Optional[str] = None, droppable: bool = False) -> int:
+        """Queue a message for the subscribers of `topic` (and WILDCARD) and return how many it was queued for.
+
+        Messages without a topic only go to WILDCARD subscribers. `droppable` marks
+        messages a later one supersedes (partial updates): the slow-consumer policy
+        may discard them and they are not kept for replay.
+        """
+        started_at = time.perf_counter()
+        text = json.dumps(message)
+        wildcard = self._topics[WILDCARD]
+        topics = [wildcard] if topic is None or topic == WILDCARD else [self._topic(topic), wildcard]
+        recipients = set().union(*(t.subscribers for t in topics))
+        if not droppable:
+            for t in topics:
+                t.backlog.append(text)
+        queued = 0
+        for client in recipients:
+            if self._enqueue(client, text, started_at, droppable):
+                queued += 1
+        self.broadcasts += 1
+        self._broadcast_times.append(time.perf_counter() - started_at)
+        return queued
+
+    def _enqueue(self, client: Client, text: str, now: float, droppable: bool) -> bool:
+        if len(client.queue) >= self.max_queue:
+            if not self._drop_oldest_droppable(client):
+                if droppable:
+                    # Everything queued must be delivered; skip this update instead
+                    self._count_drop(client)
+                    return False
+                self._remove(client, "queue full", close=True)
+                return False
+        client.queue.append((text, now, droppable))
+        client.wakeup.set()
+        self.enqueued += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, len(client.queue))
+        return True
+
+    def _drop_oldest_droppable(self, client: Client) -> bool:
+        for i, (_, _, droppable) in enumerate(client.queue):
+            if droppable:
+                del client.queue[i]
+                self._count_drop(client)
+                return True
+        return False
+
+    def _count_drop(self, client: Client):
+        client.dropped += 1
+        self.dropped += 1
+
+    async def _send_loop(self, client: Client):
+        while True:
+            while not client.queue:
+                client.wakeup.clear()
+                await client.wakeup.wait()
+            text, enqueued_at, _ = client.queue.popleft()
+            try:
+                await asyncio.wait_for(client.websocket.send_text(text), self.send_timeout)
+            except asyncio.TimeoutError:
+                self._remove(client, "send timed out", close=True)
+                return
+            except Exception as e:
+                logger.info(f"Dropping WebSocket client after failed send: {e}")
+                self._remove(client, "send failed")
+                return
+            self.delivered += 1
+            self._delivery_latencies.append(time.perf_counter() - enqueued_at)
+
+    def _remove(self, client: Client, reason: str, close: bool = False):
+        if client.closed:
+            return
+        client.closed = True
+        self._clients.discard(client)
+        for name in client.topics:
+            topic = self._topics.get(name)
+            if topic is not None:
+                topic.subscribers.discard(client)
+        client.queue.clear()
+        self.disconnects[reason] = self.disconnects.get(reason, 0) + 1
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+        if close:
+            logger.warning(f"Disconnecting slow WebSocket client: {reason}")
+            asyncio.ensure_future(self._close(client))
+
+    async def _close(self, client: Client):
+        try:
+            await asyncio.wait_for(client.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE), self.close_timeout)
+        except Exception:
+            # Already closed or unresponsive; the receive loop ends either way
+            pass
+
+    def stats(self) -> Dict:
+        depths = [len(client.queue) for client in self._clients]
+        latencies = sorted(self._delivery_latencies)
+        broadcast_times = list(self._broadcast_times)
+        return {
+            "clients": len(self._clients),
+            "connected": self.connected,
+            "topics": len(self._topics) - 1,
+            "subscriptions": sum(len(topic.subscribers) for topic in self._topics.values()),
+            "backlog_messages": sum(len(topic.backlog) for topic in self._topics.values()),
+            "replayed": self.replayed,
+            "broadcasts": self.broadcasts,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "disconnects": dict(self.disconnects),
+            "queue_depth": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "peak_queue_depth": self.peak_queue_depth,
+            "mean_delivery_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_delivery_ms": 1000 * latencies[math.ceil(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "mean_broadcast_ms": 1000 * sum(broadcast_times) / len(broadcast_times) if broadcast_times else 0.0
+        }
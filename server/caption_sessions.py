@@ -0,0 +1,228 @@
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*$')
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", '', word.lower())
+
+
+class CaptionSession:
+    """Transcript buffer for one caption stream.
+
+    Caption captures usually repeat most of the previous capture (the caption window
+    scrolls), so incoming text is merged on its overlap with the end of the buffer and
+    only genuinely new words are appended. Completed spans are cut from the words not
+    checked yet: at sentence punctuation once a span has `min_words`, at `max_words`
+    for unpunctuated auto-captions, or at a pause of `pause_seconds` between captures.
+    Given a spaCy pipeline as `nlp`, the new words go through a
+    StreamingSentenceSegmenter instead, so unpunctuated captions are cut at parsed
+    sentence and clause boundaries; its segments are joined until a span has
+    `min_words`. Spans mostly made of word n-grams from recently emitted spans are
+    dropped.
+    """
+
+    def __init__(self, min_words: int = 8, max_words: int = 30, pause_seconds: float = 3.0,
+                 coverage_threshold: float = 0.8, shingle_size: int = 4, overlap_words: int = 60,
+                 history: int = 50, nlp=None):
+        self.min_words = min_words
+        self.max_words = max_words
+        self.pause_seconds = pause_seconds
+        self.coverage_threshold = coverage_threshold
+        self.shingle_size = shingle_size
+        self.overlap_words = overlap_words
+        self._words: List[str] = []       # original words, for the emitted text
+        self._normalized: List[str] = []  # same words normalized, for matching
+        self._checked = 0                 # index of the first word not emitted yet
+        self._recent = deque(maxlen=history)  # shingle sets of emitted spans
+        self._segmenter = None
+        if nlp is not None:
+            # Imported here so the punctuation cut works without spaCy installed
+            from sentence_segmenter import StreamingSentenceSegmenter
+            self._segmenter = StreamingSentenceSegmenter(nlp=nlp, max_words=max_words)
+        self._segments: List[str] = []    # segments waiting to make up `min_words`
+        self.last_seen = time.time()
+        self.words_received = 0
+        self.words_appended = 0
+        self.spans_emitted = 0
+        self.spans_dropped = 0
+
+    def _new_words(self, words: List[str]) -> int:
+        """Index into `words` where text not already at the end of the buffer starts."""
+        normalized = [_normalize_word(w) for w in words]
+        tail = self._normalized[-self.overlap_words:]
+        # Whole capture already in the buffer (the caption window did not move); too
+        # short a capture could match by chance, so those only merge on the overlap
+        n = len(normalized)
+        if n >= self.shingle_size:
+            for start in range(len(tail) - n, -1, -1):
+                if tail[start:start + n] == normalized:
+                    return n
+        # Longest suffix of the buffer that is a prefix of the capture
+        for k in range(min(len(tail), n), 0, -1):
+            if tail[-k:] == normalized[:k]:
+                return k
+        return 0
+
+    def _shingles(self, normalized: List[str]) -> set:
+        size = min(self.shingle_size, len(normalized))
+        return {tuple(normalized[i:i + size]) for i in range(len(normalized) - size + 1)}
+
+    def _emit(self, end: int, spans: List[str], dropped: List[str]):
+        words = self._words[self._checked:end]
+        normalized = self._normalized[self._checked:end]
+        self._checked = end
+        self._emit_text(' '.join(words), normalized, spans, dropped)
+
+    def _emit_text(self, text: str, normalized: List[str], spans: List[str], dropped: List[str]):
+        shingles = self._shingles(normalized)
+        seen = set().union(*self._recent) if self._recent else set()
+        if shingles and len(shingles & seen) / len(shingles) >= self.coverage_threshold:
+            self.spans_dropped += 1
+            dropped.append(text)
+            return
+        self._recent.append(shingles)
+        self.spans_emitted += 1
+        spans.append(text)
+
+    def _emit_segment(self, segment: str, spans: List[str], dropped: List[str]):
+        self._segments.append(segment)
+        if sum(len(segment.split()) for segment in self._segments) >= self.min_words:
+            text = ' '.join(self._segments)
+            self._segments = []
+            self._emit_text(text, [_normalize_word(w) for w in text.split()], spans, dropped)
+
+    def _cut_spans(self, spans: List[str], dropped: List[str]):
+        if self._segmenter is not None:
+            # The segmenter keeps the unfinished segment itself
+            new = self._words[self._checked:]
+            self._checked = len(self._words)
+            for segment in self._segmenter.feed(' '.join(new)):
+                self._emit_segment(segment, spans, dropped)
+            return
+        while True:
+            pending = len(self._words) - self._checked
+            end = None
+            for i in range(self._checked + self.min_words - 1, min(len(self._words), self._checked + self.max_words)):
+                if SENTENCE_END.search(self._words[i]):
+                    end = i + 1
+                    break
+            if end is None and pending >= self.max_words:
+                end = self._checked + self.max_words
+            if end is None:
+                return
+            self._emit(end, spans, dropped)
+
+    def flush(self, spans: List[str], dropped: List[str]):
+        """Emit whatever is pending if it is long enough to be a claim, else discard it."""
+        self._cut_spans(spans, dropped)
+        if self._segmenter is not None:
+            for segment in self._segmenter.flush():
+                self._emit_segment(segment, spans, dropped)
+            self._segments = []
+        elif len(self._words) - self._checked >= self.min_words:
+            self._emit(len(self._words), spans, dropped)
+        self._checked = len(self._words)
+
+    def ingest(self, text: str, final: bool = False) -> Dict:
+        spans, dropped = [], []
+        now = time.time()
+        if now - self.last_seen >= self.pause_seconds:
+            # The speaker paused, so the pending words end a thought
+            self.flush(spans, dropped)
+        self.last_seen = now
+
+        words = text.split()
+        self.words_received += len(words)
+        new = words[self._new_words(words):]
+        self._words.extend(new)
+        self._normalized.extend(_normalize_word(w) for w in new)
+        self.words_appended += len(new)
+
+        if final:
+            self.flush(spans, dropped)
+        else:
+            self._cut_spans(spans, dropped)
+
+        # Keep only the unchecked words plus enough history to merge the next capture
+        keep_from = max(0, min(self._checked, len(self._words) - self.overlap_words))
+        if keep_from:
+            del self._words[:keep_from]
+            del self._normalized[:keep_from]
+            self._checked -= keep_from
+        return {"spans": spans, "dropped": dropped}
+
+    def stats(self) -> Dict:
+        return {
+            "words_received": self.words_received,
+            "words_appended": self.words_appended,
+            "pending_words": len(self._words) - self._checked + sum(len(s.split()) for s in self._segments)
+            + (self._segmenter.pending_words if self._segmenter is not None else 0),
+            "spans_emitted": self.spans_emitted,
+            "spans_dropped": self.spans_dropped
+        }
+
+
+class CaptionSessions:
+    """Caption sessions by id; sessions idle for `session_ttl` seconds are forgotten.
+
+    `nlp` is the spaCy pipeline new sessions segment with; it may be set after
+    construction, once loaded.
+    """
+
+    def __init__(self, session_ttl: float = 600, max_sessions: int = 1000, nlp=None, **session_options):
+        self.session_ttl = session_ttl
+        self.nlp = nlp
+        self.max_sessions = max_sessions
+        self.session_options = session_options
+        self._sessions: "OrderedDict[str, CaptionSession]" = OrderedDict()
+        self.captures = 0
+        self.spans_emitted = 0
+        self.spans_dropped = 0
+        self.expired = 0
+
+    def _prune(self):
+        cutoff = time.time() - self.session_ttl
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_seen >= cutoff and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def ingest(self, session_id: str, text: str, final: bool = False) -> Dict:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = CaptionSession(nlp=self.nlp, **self.session_options)
+        self._sessions.move_to_end(session_id)
+        result = session.ingest(text, final)
+        self.captures += 1
+        self.spans_emitted += len(result["spans"])
+        self.spans_dropped += len(result["dropped"])
+        self._prune()
+        return result
+
+    def close(self, session_id: str) -> Optional[Dict]:
+        """Flush and forget a session; returns its last spans, or None if unknown."""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return None
+        spans, dropped = [], []
+        session.flush(spans, dropped)
+        self.spans_emitted += len(spans)
+        self.spans_dropped += len(dropped)
+        return {"spans": spans, "dropped": dropped}
+
+    def stats(self) -> Dict:
+        return {
+            "sessions": len(self._sessions),
+            "segmenter": self.nlp is not None,
+            "captures": self.captures,
+            "spans_emitted": self.spans_emitted,
+            "spans_dropped": self.spans_dropped,
+            "checks_saved_ratio": 1 - self.spans_emitted / self.captures if self.captures else 0.0,
+            "expired": self.expired
+        }
@@ -0,0 +1,142 @@
+import json
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Seed examples in the register of live debate captions; extend with `training_path`
+CLAIMS = [
+    "they're eating the dogs in Springfield",
+    "immigrants are eating the pets of the people that live there",
+    "crime in this country is up 40 percent since they took office",
+    "inflation hit 9 percent last year the highest in forty years",
+    "she tried to kill the bill that would have put thousands of agents on the border",
+    "the unemployment rate is the lowest it has been in fifty years",
+    "we created fifteen million new jobs in the last three years",
+    "millions of people came into our country illegally last year",
+    "the city manager said there were no credible reports of pets being harmed",
+    "he wants to cut social security and medicare",
+    "the vaccine was tested on over forty thousand people",
+    "China is paying billions of dollars in tariffs",
+    "the murder rate in new york went down last year",
+    "the wall was never built only fifty miles were finished",
+    "our gas prices doubled under this administration",
+    "the national debt is now over thirty trillion dollars",
+    "more than one million people died of covid in the united states",
+    "the abortion ban has no exceptions for rape or incest",
+    "Venezuela emptied its prisons into our country",
+    "we had the greatest economy in the history of our country",
+    "the bill passed the senate with bipartisan support",
+    "wages went up faster than inflation for the first time in years",
+    "the federal reserve raised interest rates eleven times",
+    "Ohio has the highest number of migrants per capita",
+    "the climate law is the largest investment in clean energy ever",
+    "he was convicted on thirty four felony counts",
+    "the border crossings are down fifty percent since june",
+    "our troops left billions of dollars of equipment in Afghanistan",
+    "the average family is paying a thousand dollars more a month for groceries",
+    "manufacturing jobs grew by eight hundred thousand",
+]
+NON_CLAIMS = [
+    "would like to respond let me just ask",
+    "as far as rallies are concerned",
+    "thank you very much",
+    "let me just say here",
+    "I just want to clarify here",
+    "first let me respond to that",
+    "we'll get to that in a moment",
+    "and then and and so",
+    "you know what I mean",
+    "that's a great question",
+    "I'm talking now if you don't mind",
+    "go ahead please finish your answer",
+    "welcome back to the debate",
+    "we're going to take a short break",
+    "can I respond to that",
+    "it's very simple phrase make America great again",
+    "people want to take their country back",
+    "I think that's a shame",
+    "look at what's happening",
+    "she can't talk about that",
+    "let's move on to the next topic",
+    "I want to thank everyone for being here tonight",
+    "that's not what I said",
+    "you have two minutes",
+    "so maybe he said that",
+    "we need a leader who will fight for you",
+    "I believe in the American people",
+    "this is what's happening in our country and it's a shame",
+    "they want to bring our country back",
+    "um uh well you know",
+]
+
+
+class CheckWorthinessFilter:
+    """Scores how likely a statement is a checkable factual claim.
+
+    A logistic regression on sentence embeddings (the MiniLM vectors the pipeline
+    computes for every statement anyway), trained at startup on the seed examples
+    above plus any labeled {"text": ..., "label": 0/1} lines in `training_path`.
+    Statements scoring below `threshold` are not worth a full check. Statements with
+    fewer than `min_words` words always score 0.
+    """
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], threshold: float = 0.5,
+                 min_words: int = 4, training_path: Optional[str] = None, log_every: int = 50):
+        self.threshold = threshold
+        self.min_words = min_words
+        self.log_every = log_every
+        texts = CLAIMS + NON_CLAIMS
+        labels = [1] * len(CLAIMS) + [0] * len(NON_CLAIMS)
+        if training_path:
+            with open(training_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        example = json.loads(line)
+                        texts.append(example["text"])
+                        labels.append(int(example["label"]))
+        # Deferred: importing scikit-learn takes seconds and is only needed once models load
+        from sklearn.linear_model import LogisticRegression
+        self.classifier = LogisticRegression(class_weight="balanced", C=4.0, max_iter=1000)
+        self.classifier.fit(self._normalize(encode(texts)), labels)
+        self.scored = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def score(self, statements: List[str], vectors: np.ndarray) -> List[float]:
+        """Check-worthiness in [0, 1] for each statement, given its embedding."""
+        if not statements:
+            return []
+        scores = self.classifier.predict_proba(self._normalize(vectors))[:, 1]
+        return [
+            0.0 if len(statement.split()) < self.min_words else float(score)
+            for statement, score in zip(statements, scores)
+        ]
+
+    def record(self, scores: List[float]):
+        """Count scored statements and log the skip rate every `log_every` of them."""
+        for _ in scores:
+            self.scored += 1
+            if self.scored % self.log_every == 0:
+                print(f"Check-worthiness: skipped {self.skipped}/{self.scored} statements "
+                      f"({100 * self.skipped / self.scored:.1f}%) below threshold {self.threshold}")
+
+    def record_skipped(self, count: int = 1):
+        """Count statements that were not checked because of their score.
+
+        Callers that score without skipping (e.g. only to prioritize) don't call this,
+        so the skip rate reflects checks actually saved.
+        """
+        self.skipped += count
+
+    def stats(self) -> Dict:
+        return {
+            "threshold": self.threshold,
+            "scored": self.scored,
+            "skipped": self.skipped,
+            "skip_rate": self.skipped / self.scored if self.scored else 0.0
+        }
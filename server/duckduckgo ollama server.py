@@ -1,30 +1,82 @@
 from duckduckgo_search import DDGS
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 import re
+import os
+import math
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import httpx
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import time
 import json
 import subprocess
-import sys
 import platform
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from typing import Optional
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
+from source_fetcher import SourceFetcher, format_fetch_timings
+from verdict_cache import VerdictCache, normalize_statement
+from page_cache import PageCache
+from search_cache import SearchCache
+from embedding_cache import EmbeddingCache
+from embedding_engine import EmbeddingEngine
+from evidence_index import EvidenceIndex
+from http_clients import HttpClientPool
+from single_flight import SingleFlight
+from html_extract import extract_text_from_bytes
+from jobs import JobQueue, QueueFullError, PRIORITIES
+from caption_sessions import CaptionSessions
+from check_worthiness import CheckWorthinessFilter
+from model_backends import load_sentence_transformer
+from readiness import Readiness, NotReadyError
 
+PAGE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "page_cache.sqlite3")
+EVIDENCE_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "evidence_index")
+# Job API: number of checks run at once and how many may wait before new jobs are rejected
+JOB_WORKERS = int(os.environ.get("FACTCHECK_JOB_WORKERS", 4))
+JOB_QUEUE_SIZE = int(os.environ.get("FACTCHECK_JOB_QUEUE_SIZE", 100))
+MAX_BATCH_STATEMENTS = 100
+# Sentence encoder backend: torch (default), int8, onnx or onnx-int8; see benchmarks/bench_backends.py
+EMBEDDING_BACKEND = os.environ.get("FACTCHECK_EMBEDDING_BACKEND", "torch")
+# spaCy model live captions are segmented with; empty to cut them at punctuation only
+CAPTION_SEGMENTER_MODEL = os.environ.get("FACTCHECK_CAPTION_SEGMENTER", "en_core_web_sm")
+
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarity of the rows of a and b (as sklearn's, without importing sklearn)."""
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    a_norms = np.linalg.norm(a, axis=1, keepdims=True)
+    b_norms = np.linalg.norm(b, axis=1, keepdims=True)
+    return (a / np.where(a_norms == 0, 1, a_norms)) @ (b / np.where(b_norms == 0, 1, b_norms)).T
 
 
 class OllamaFactChecker:
-    def __init__(self, model_name="mistral"):
+    def __init__(self, model_name="mistral", embedding_batch_size=128, embedding_batch_wait=0.005,
+                 max_concurrent_fetches=5, per_domain_interval=1.0, overfetch_factor=1.0, cache_similarity_threshold=0.92,
+                 cache_max_entries=1024, cache_ttl=3600, page_cache_path=PAGE_CACHE_PATH,
+                 page_cache_max_bytes=64 * 1024 * 1024, page_cache_ttl=24 * 3600, search_concurrency=3,
+                 search_cache_ttl=3600, embedding_cache_size=10000, evidence_index_path=EVIDENCE_INDEX_PATH,
+                 evidence_max_passages=50000, local_min_similarity=0.6, local_min_sources=3,
+                 evidence_save_every=20, stream_update_interval=0.25, max_http_connections=100,
+                 per_host_connections=6, max_page_bytes=1024 * 1024, parse_workers=min(4, os.cpu_count() or 1),
+                 worthiness_threshold=0.5, worthiness_training_path=None, embedding_backend=EMBEDDING_BACKEND,
+                 ready_timeout=30.0, ollama_retry_interval=30.0):
+        # Parse workers are forked by start(), before the model loads and any threads start
+        self.parse_workers = parse_workers
+        self.parse_pool: Optional[ProcessPoolExecutor] = None
         self.model_name = model_name
+        self.overfetch_factor = overfetch_factor
         self.ollama_url = "http://localhost:11434/api/chat"
-        self.search_engine = DDGS()
+        # Minimum seconds between streamed explanation updates
+        self.stream_update_interval = stream_update_interval
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -47,10 +99,229 @@ class OllamaFactChecker:
             'amazon.com',
             'ebay.com'
         }
-        # Initialize the sentence transformer model
-        print("Loading sentence transformer model...")
-        self.sentence_transformer = SentenceTransformer('all-MiniLM-L6-v2')
+        # The models, the saved evidence index and Ollama are loaded in the background by
+        # start(), so the server answers (e.g. /health, /ready) while they come up.
+        # Checks wait up to `ready_timeout` seconds for them. Starting Ollama is retried
+        # every `ollama_retry_interval` seconds until it works.
+        self.readiness = Readiness(["sentence_encoder", "check_worthiness", "evidence_index", "ollama"])
+        self.ready_timeout = ready_timeout
+        self.ollama_retry_interval = ollama_retry_interval
+        self._startup: Optional[asyncio.Task] = None
+        self.embedding_backend = embedding_backend
+        self.sentence_transformer = None
+        # Cheap claim detector on the same embeddings, so small talk skips the pipeline
+        self.worthiness: Optional[CheckWorthinessFilter] = None
+        self.worthiness_threshold = worthiness_threshold
+        self._worthiness_options = {"threshold": worthiness_threshold, "training_path": worthiness_training_path}
+        # Encoding is CPU-bound, so it runs on its own thread to keep the event loop free.
+        # Requests from concurrent checks are merged into shared forward passes.
+        self.embedding_executor = ThreadPoolExecutor(max_workers=1)
+        self.embedding_engine = EmbeddingEngine(
+            None,  # set once the model has loaded
+            self.embedding_executor,
+            max_batch_size=embedding_batch_size,
+            max_wait=embedding_batch_wait
+        )
+        # Process-wide sentence embeddings, shared by the per-check caches (0 disables)
+        self.embedding_cache = EmbeddingCache(max_entries=embedding_cache_size) if embedding_cache_size else None
+        # Pooled keep-alive clients for scraping, Ollama and forwarding results
+        self.http = HttpClientPool(max_connections=max_http_connections, per_host_limit=per_host_connections)
+        # Most bytes read from one page before extracting its text
+        self.max_page_bytes = max_page_bytes
+        # Concurrent page fetching with a global cap and per-domain spacing
+        self.source_fetcher = SourceFetcher(
+            self._extract_text_from_url,
+            max_concurrency=max_concurrent_fetches,
+            per_domain_interval=per_domain_interval
+        )
+        # Verdicts for near-duplicate claims, plus checks currently running by normalized text
+        self.verdict_cache = VerdictCache(
+            similarity_threshold=cache_similarity_threshold,
+            max_entries=cache_max_entries,
+            ttl=cache_ttl
+        )
+        self._in_flight: Dict[str, Tuple[asyncio.Future, list]] = {}  # key -> (task, update listeners)
+        # Extracted page text persisted across restarts; opened by start()
+        self.page_cache: Optional[PageCache] = None
+        self._page_cache_options = {"path": page_cache_path, "max_bytes": page_cache_max_bytes,
+                                    "ttl": page_cache_ttl}
+        # DDGS results by normalized query, and a cap on searches running at once
+        self.search_cache = SearchCache(ttl=search_cache_ttl)
+        self._search_semaphore = asyncio.Semaphore(search_concurrency)
+        # Identical searches and page fetches from concurrent checks share one request
+        self._searches = SingleFlight()
+        self._page_fetches = SingleFlight()
+        # Sentences from every scraped page, searched before going back to the web
+        self.evidence_index = EvidenceIndex(evidence_index_path, max_passages=evidence_max_passages, load=False)
+        self.local_min_similarity = local_min_similarity
+        self.local_min_sources = local_min_sources
+        self.evidence_save_every = evidence_save_every
+        self._evidence_unsaved = 0
+
+    def start(self):
+        """Start loading the models and Ollama in the background; see `readiness` for progress.
+
+        The parse workers and the page cache are set up here too rather than in the
+        constructor, so importing the server module stays cheap.
+        """
+        if self._startup is None:
+            self.parse_pool = self._start_parse_pool(self.parse_workers)
+            self.page_cache = PageCache(**self._page_cache_options)
+            self._startup = asyncio.ensure_future(self._load_components())
+
+    async def _load_components(self):
+        loop = asyncio.get_running_loop()
+
+        async def encoder_and_filter():
+            if await self.readiness.run("sentence_encoder", self._load_sentence_encoder):
+                await self.readiness.run("check_worthiness", lambda: self._load_worthiness_filter(loop))
+            else:
+                self.readiness.fail("check_worthiness", "sentence encoder failed to load")
+
+        await asyncio.gather(
+            encoder_and_filter(),
+            self.readiness.run("evidence_index", self.evidence_index.load),
+            self.readiness.run("ollama", self._start_ollama, retry_interval=self.ollama_retry_interval)
+        )
+
+    def _load_sentence_encoder(self):
+        print(f"Loading sentence transformer model ({self.embedding_backend} backend)...")
+        model = load_sentence_transformer('all-MiniLM-L6-v2', self.embedding_backend)
+        # The first forward pass initializes kernels and thread pools; pay for it here
+        model.encode(["warm up"], show_progress_bar=False)
+        self.sentence_transformer = model
+        self.embedding_engine.model = model
+
+    def _load_worthiness_filter(self, loop: asyncio.AbstractEventLoop):
+        # Checks may already be encoding; the seed sentences go through the same engine so
+        # the model (and its tokenizer, which is not thread-safe) is only used by one thread
+        self.worthiness = CheckWorthinessFilter(
+            lambda texts: asyncio.run_coroutine_threadsafe(self.embedding_engine.encode(texts), loop).result(),
+            **self._worthiness_options
+        )
+
+    def _start_ollama(self):
         self.ensure_ollama_running()
+        self.ensure_model_available()
+        # An empty prompt makes Ollama load the model into memory, so the first check
+        # does not wait for it
+        response = self.http.session.post(
+            "http://localhost:11434/api/generate",
+            json={"model": self.model_name, "prompt": ""},
+            timeout=300
+        )
+        response.raise_for_status()
+
+    async def wait_ready(self, *components: str):
+        """Wait for the components (default: all) to load; NotReadyError if one failed or takes too long."""
+        self.start()
+        await self.readiness.wait(*components, timeout=self.ready_timeout)
+
+    async def wait_worthiness(self) -> bool:
+        """Wait for the check-worthiness filter; False if it failed to load for good.
+
+        Without the filter statements are still checked, just not filtered, so a bad
+        training file doesn't take the server down.
+        """
+        try:
+            await self.wait_ready("sentence_encoder", "check_worthiness")
+        except NotReadyError as e:
+            if e.component == "check_worthiness" and e.retry_after is None:
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def _start_parse_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+        """Start a process pool for HTML parsing, or return None to parse on a thread.
+
+        Workers are forked so they don't re-import this module (and reload the models);
+        where fork is unavailable (Windows) parsing stays on a thread.
+        """
+        if workers <= 0 or "fork" not in multiprocessing.get_all_start_methods():
+            return None
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+        # With fork, the first task starts every worker at once, so do it now
+        pool.submit(int).result()
+        print(f"Started {workers} HTML parse workers")
+        return pool
+
+    async def _extract(self, body: bytes, encoding: str) -> str:
+        """Parse and clean a page off the event loop, in a worker process when available."""
+        if self.parse_pool is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self.parse_pool, extract_text_from_bytes, body, encoding)
+            except BrokenProcessPool:
+                # A worker died (e.g. crashed on a malformed page); re-forking now would copy
+                # the model and running threads, so fall back to parsing on a thread
+                print("HTML parse pool broke, parsing on a thread from now on")
+                self.parse_pool = None
+        return await asyncio.to_thread(extract_text_from_bytes, body, encoding)
+
+    async def aclose(self):
+        if self._startup is not None:
+            self._startup.cancel()
+        await self.http.aclose()
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown(wait=False, cancel_futures=True)
+        await self.embedding_engine.close()
+        self.embedding_executor.shutdown(wait=False)
+        if self.page_cache is not None:
+            self.page_cache.close()
+        await asyncio.to_thread(self.evidence_index.save)
+
+    async def _encode(self, sentences: List[str]) -> np.ndarray:
+        """Encode sentences through the shared micro-batching engine."""
+        return await self.embedding_engine.encode(sentences)
+
+    async def _search(self, query: str, max_results: int) -> List[Dict]:
+        """Run a DDGS text search in a worker thread, answering repeats from the search cache."""
+        cached = self.search_cache.get(query, max_results)
+        if cached is not None:
+            return cached
+
+        def run():
+            # DDGS sessions are not safe to share between threads, so each search gets its own
+            results = list(DDGS().text(query, max_results=max_results))
+            # Cached from the worker so the result is kept even if the caller stopped waiting
+            self.search_cache.put(query, max_results, results)
+            return results
+
+        async def search():
+            async with self._search_semaphore:
+                return await asyncio.to_thread(run)
+
+        return await self._searches.run((normalize_statement(query), max_results), search)
+
+    async def _search_many(self, queries: List[str], max_results: int, wanted_urls: int,
+                           exclude: set = frozenset()) -> List[Dict]:
+        """Run several searches concurrently and return their results with unseen URLs.
+
+        Stops as soon as `wanted_urls` new URLs are found; searches that have not started
+        by then are cancelled so they don't spend DDGS rate limit.
+        """
+        tasks = [asyncio.ensure_future(self._search(query, max_results)) for query in queries]
+        seen = set(exclude)
+        new_results = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    results = await next_done
+                except Exception as e:
+                    print(f"Search error: {e}")
+                    continue
+                for result in results:
+                    url = result.get('link') or result.get('href')
+                    if url and url not in seen:
+                        seen.add(url)
+                        new_results.append(result)
+                if len(new_results) >= wanted_urls:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        return new_results
 
     # Add this new method after __init__:
     def is_blacklisted(self, url: str) -> bool:
@@ -61,21 +332,50 @@ class OllamaFactChecker:
         except:
             return False
     
-    def summarize_combined_content(self, statement: str, sources: List[Dict], max_sentences: int = 10) -> str:
+    @staticmethod
+    def _split_sentences(text: str) -> List[str]:
+        return [s.strip() for s in text.split('.') if len(s.strip()) > 20]
+
+    async def _encode_cached(self, sentences: List[str], cache: Optional[EmbeddingCache] = None) -> np.ndarray:
+        """Encode sentences, only running the model for ones `cache` has not seen."""
+        if cache is None:
+            cache = EmbeddingCache(parent=self.embedding_cache)
+        vectors = {}
+        missing = []
+        for sentence in dict.fromkeys(sentences):
+            vector = cache.get(sentence)
+            if vector is None:
+                missing.append(sentence)
+            else:
+                vectors[sentence] = vector
+        if missing:
+            for sentence, vector in zip(missing, await self._encode(missing)):
+                cache.put(sentence, vector)
+                vectors[sentence] = vector
+        return np.stack([vectors[s] for s in sentences])
+
+    async def summarize_combined_content(self, statement: str, sources: List[Dict], max_sentences: int = 10,
+                                         embeddings: Optional[EmbeddingCache] = None) -> str:
         # Combine all source content with source attribution
         combined_text = ""
         for source in sources:
             combined_text += f"\nFrom {source['domain']}:\n{source['content']}\n"
         
-        # Split combined content into sentences
-        sentences = [s.strip() for s in combined_text.split('.') if len(s.strip()) > 20]
+        # Split each source's summary back into the sentences picked in the first stage,
+        # whose embeddings are already in the request's cache
+        sentences = []
+        sentence_domains = []
+        for source in sources:
+            for sentence in self._split_sentences(source['content']):
+                sentences.append(sentence)
+                sentence_domains.append(source['domain'])
         
         if not sentences:
             return combined_text
 
         # Get embeddings for the statement and all sentences
-        statement_embedding = self.sentence_transformer.encode([statement], show_progress_bar=False)
-        sentence_embeddings = self.sentence_transformer.encode(sentences, show_progress_bar=False)
+        statement_embedding = await self._encode_cached([statement], embeddings)
+        sentence_embeddings = await self._encode_cached(sentences, embeddings)
 
         # Calculate similarity scores
         similarities = cosine_similarity(statement_embedding, sentence_embeddings)[0]
@@ -83,23 +383,33 @@ class OllamaFactChecker:
         # Get the indices of the most relevant sentences
         top_indices = np.argsort(similarities)[-max_sentences:]
 
-        # Return the most relevant sentences in their original order
-        relevant_sentences = [sentences[i] for i in sorted(top_indices)]
+        # Return the most relevant sentences in their original order, attributing the
+        # first one kept from each source
+        relevant_sentences = []
+        attributed_domains = set()
+        for i in sorted(top_indices):
+            domain = sentence_domains[i]
+            if domain in attributed_domains:
+                relevant_sentences.append(sentences[i])
+            else:
+                relevant_sentences.append(f"From {domain}:\n{sentences[i]}")
+                attributed_domains.add(domain)
         
         summarized_text = '. '.join(relevant_sentences) + '.'
         print(f"\nReduced combined content from {len(combined_text)} to {len(summarized_text)} characters")
         return summarized_text
 
-    def summarize_content(self, statement: str, content: str, max_sentences: int = 5) -> str:
+    async def summarize_content(self, statement: str, content: str, max_sentences: int = 5,
+                                embeddings: Optional[EmbeddingCache] = None) -> str:
         # Split content into sentences
-        sentences = [s.strip() for s in content.split('.') if len(s.strip()) > 20]
+        sentences = self._split_sentences(content)
         
         if not sentences:
             return content
 
         # Get embeddings for the statement and all sentences
-        statement_embedding = self.sentence_transformer.encode([statement], show_progress_bar=False)
-        sentence_embeddings = self.sentence_transformer.encode(sentences, show_progress_bar=False)
+        statement_embedding = await self._encode_cached([statement], embeddings)
+        sentence_embeddings = await self._encode_cached(sentences, embeddings)
 
         # Calculate similarity scores
         similarities = cosine_similarity(statement_embedding, sentence_embeddings)[0]
@@ -113,7 +423,68 @@ class OllamaFactChecker:
         return '. '.join(relevant_sentences) + '.'
 
 
-    def _analyze_with_ollama(self, statement: str, summarized_content: str) -> Dict:
+    @staticmethod
+    def _partial_json_string(text: str, field: str) -> Optional[str]:
+        """Decode the (possibly unterminated) string value of `field` in partial JSON text."""
+        match = re.search(rf'"{field}"\s*:\s*"((?:[^"\\]|\\.)*)', text)
+        if not match:
+            return None
+        raw = match.group(1)
+        # The value may end mid-escape (e.g. half of a \u sequence); trim until it decodes
+        for end in range(len(raw), max(len(raw) - 6, 0) - 1, -1):
+            try:
+                return json.loads(f'"{raw[:end]}"')
+            except json.JSONDecodeError:
+                continue
+        return None
+
+    async def _stream_ollama(self, statement: str, prompt: str, on_update) -> str:
+        """Stream the Ollama completion, reporting the verdict and explanation as they arrive."""
+        loop = asyncio.get_running_loop()
+        response_content = ""
+        last_update = (None, None)
+        last_update_at = 0.0
+        async with self.http.stream(
+            "POST",
+            self.ollama_url,
+            json={
+                "model": self.model_name,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "stream": True
+            }
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                response_content += chunk.get('message', {}).get('content', '')
+
+                # Only a fully closed verdict string is reported, the explanation may be partial
+                verdict = re.search(r'"verdict"\s*:\s*"([^"]*)"', response_content)
+                update = (
+                    verdict.group(1) if verdict else None,
+                    self._partial_json_string(response_content, "explanation")
+                )
+                if update == last_update or update == (None, None):
+                    continue
+                # Send a newly completed verdict at once, but throttle explanation updates
+                if update[0] == last_update[0] and loop.time() - last_update_at < self.stream_update_interval:
+                    continue
+                last_update, last_update_at = update, loop.time()
+                await on_update({
+                    "statement": statement,
+                    "result": update[0],
+                    "explanation": update[1] or ""
+                })
+        return response_content
+
+    async def _analyze_with_ollama(self, statement: str, summarized_content: str, on_update=None) -> Dict:
         # Create a more concise prompt using the final summary
         prompt = f"""Fact-check this statement using the provided evidence:
 
@@ -132,23 +503,26 @@ class OllamaFactChecker:
             print("\nSending request to Ollama...")
             print(f"Prompt length: {len(prompt)} characters")
             
-            response = requests.post(
-                "http://localhost:11434/api/chat",
-                json={
-                    "model": self.model_name,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "stream": False
-                }
-            )
-            response.raise_for_status()
-            
-            response_data = response.json()
-            response_content = response_data.get('message', {}).get('content', '')
+            if on_update is not None:
+                response_content = await self._stream_ollama(statement, prompt, on_update)
+            else:
+                response = await self.http.post(
+                    self.ollama_url,
+                    json={
+                        "model": self.model_name,
+                        "messages": [
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ],
+                        "stream": False
+                    }
+                )
+                response.raise_for_status()
+                
+                response_data = response.json()
+                response_content = response_data.get('message', {}).get('content', '')
             
             print("\nReceived response from Ollama")
             print(f"Response preview: {response_content[:200]}...")
@@ -174,7 +548,7 @@ class OllamaFactChecker:
 
     def ensure_ollama_running(self):
         try:
-            requests.get("http://localhost:11434/api/version")
+            self.http.session.get("http://localhost:11434/api/version")
             print("Ollama server is already running")
             return
         except requests.exceptions.ConnectionError:
@@ -194,9 +568,8 @@ class OllamaFactChecker:
             attempts = 0
             while attempts < max_attempts:
                 try:
-                    requests.get("http://localhost:11434/api/version")
+                    self.http.session.get("http://localhost:11434/api/version")
                     print("Ollama server started successfully")
-                    self.ensure_model_available()
                     return
                 except requests.exceptions.ConnectionError:
                     attempts += 1
@@ -207,14 +580,16 @@ class OllamaFactChecker:
         except Exception as e:
             print(f"Error starting Ollama: {e}")
             print("Please make sure Ollama is installed and accessible from command line")
-            sys.exit(1)
+            raise RuntimeError(f"Error starting Ollama: {e}") from e
 
     def ensure_model_available(self):
         try:
-            response = requests.get("http://localhost:11434/api/tags")
+            response = self.http.session.get("http://localhost:11434/api/tags")
             if response.status_code == 200:
                 models = response.json()
-                model_exists = any(model['name'] == self.model_name for model in models['models'])
+                # Tags are listed with their version, e.g. "mistral:latest"
+                names = {self.model_name, f"{self.model_name}:latest"}
+                model_exists = any(model['name'] in names for model in models['models'])
                 
                 if not model_exists:
                     print(f"Model {self.model_name} not found. Pulling model...")
@@ -222,21 +597,185 @@ class OllamaFactChecker:
                     print(f"Model {self.model_name} pulled successfully")
         except Exception as e:
             print(f"Error checking/pulling model: {e}")
-            sys.exit(1)
+            raise RuntimeError(f"Error checking/pulling model: {e}") from e
+
+    async def check_statement(self, statement: str, overfetch_factor: Optional[float] = None,
+                              on_update=None, embeddings: Optional[EmbeddingCache] = None) -> Dict:
+        """Fact-check a statement.
 
-    def check_statement(self, statement: str) -> Dict:
+        Near-duplicate statements are answered from the verdict cache, and identical
+        statements already being checked wait for that run instead of starting another.
+
+        `overfetch_factor` above 1.0 fetches that many times more candidate pages than
+        needed and moves on as soon as enough of them have content, trading extra
+        requests for lower tail latency. Defaults to the checker's setting.
+
+        If `on_update` is given, the model's answer is streamed and the coroutine is
+        awaited with partial {"statement", "result", "explanation"} dicts as the verdict
+        and explanation arrive.
+
+        `embeddings` is an extra cache layered under the check's own one, letting
+        several checks share sentence vectors.
+        """
+        # The check-worthiness filter is not needed here, so checks don't depend on it
+        await self.wait_ready("sentence_encoder", "evidence_index", "ollama")
+        if overfetch_factor is None:
+            overfetch_factor = self.overfetch_factor
+
+        key = normalize_statement(statement)
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            print(f"Joining in-flight check for: {statement}")
+            task, listeners = in_flight
+        else:
+            listeners = []
+            task = asyncio.ensure_future(
+                self._check_statement_cached(statement, overfetch_factor, listeners, embeddings)
+            )
+            self._in_flight[key] = (task, listeners)
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        if on_update is not None:
+            listeners.append(on_update)
         try:
+            # Shielded so one caller going away does not cancel the run for the others
+            result = await asyncio.shield(task)
+        finally:
+            if on_update is not None:
+                listeners.remove(on_update)
+        return {**result, "statement": statement}
+
+    async def score_worthiness(self, statements: List[str],
+                               embeddings: Optional[EmbeddingCache] = None) -> List[float]:
+        """Check-worthiness of each statement in [0, 1]; below `worthiness_threshold` means skip.
+
+        The embeddings land in the cache, so checking a statement afterwards does not
+        encode it again. If the filter failed to load, every statement scores 1.0.
+        """
+        if not statements:
+            return []
+        if not await self.wait_worthiness():
+            return [1.0] * len(statements)
+        vectors = await self._encode_cached(statements, embeddings)
+        scores = self.worthiness.score(statements, vectors)
+        self.worthiness.record(scores)
+        return scores
+
+    async def check_batch(self, statements: List[str], overfetch_factor: Optional[float] = None,
+                          on_result=None, skip_unworthy: bool = False) -> List[Dict]:
+        """Fact-check many statements at once, returning one result per statement in order.
+
+        Repeated statements are checked once. All statements are embedded in a single
+        pass and the checks then run concurrently, sharing one embedding cache, so pages
+        several statements land on are encoded once, and identical searches and page
+        fetches collapse into one request. The LLM analyses overlap as well.
+
+        `on_result` is awaited with each result as soon as its statement is done. With
+        `skip_unworthy`, statements the check-worthiness filter rejects are answered
+        "Not Checked" without running the pipeline.
+        """
+        unique = {}
+        for statement in statements:
+            unique.setdefault(normalize_statement(statement), statement)
+
+        embeddings = EmbeddingCache(parent=self.embedding_cache)
+        scores = await self.score_worthiness(list(unique.values()), embeddings)
+
+        async def check(statement: str, score: float) -> Dict:
+            if skip_unworthy and score < self.worthiness_threshold:
+                self.worthiness.record_skipped()
+                return {
+                    "statement": statement,
+                    "result": "Not Checked",
+                    "explanation": "Skipped - this does not look like a checkable factual claim.",
+                    "check_worthiness": score
+                }
+            try:
+                result = await self.check_statement(statement, overfetch_factor, embeddings=embeddings)
+            except Exception as e:
+                print(f"Batch check failed for {statement}: {e}")
+                return {
+                    "statement": statement,
+                    "result": "Unable to Verify",
+                    "explanation": f"Unable to verify - error: {e}"
+                }
+            if on_result is not None:
+                try:
+                    await on_result(result)
+                except Exception as e:
+                    print(f"Error handling batch result: {e}")
+            return result
+
+        results = await asyncio.gather(*(check(statement, score) for statement, score in zip(unique.values(), scores)))
+        print(f"Embedding cache for this batch: {embeddings.stats()}")
+        by_key = dict(zip(unique, results))
+        return [{**by_key[normalize_statement(s)], "statement": s} for s in statements]
+
+    async def _check_statement_cached(self, statement: str, overfetch_factor: float, listeners: list,
+                                      shared_embeddings: Optional[EmbeddingCache] = None) -> Dict:
+        # Embeddings computed for this check, so the statement and the per-source
+        # sentences are only encoded once across both summarization stages
+        if shared_embeddings is None:
+            shared_embeddings = self.embedding_cache
+        embeddings = EmbeddingCache(parent=shared_embeddings)
+        statement_embedding = (await self._encode_cached([statement], embeddings))[0]
+        cached = self.verdict_cache.get(statement_embedding, statement)
+        if cached is not None:
+            print(f"Verdict cache hit for: {statement}")
+            return cached
+
+        # Updates are delivered by their own task so slow listeners (e.g. forwarding to
+        # port 8000) never hold up reading the model's stream. Only the newest undelivered
+        # update is kept, since each one supersedes the previous.
+        pending: List[Dict] = []
+        wakeup = asyncio.Event()
+
+        async def send(listener, update: Dict):
+            try:
+                await listener(update)
+            except Exception as e:
+                print(f"Error sending streaming update: {e}")
+
+        async def deliver():
+            while True:
+                await wakeup.wait()
+                wakeup.clear()
+                update = pending.pop()
+                await asyncio.gather(*(send(listener, update) for listener in list(listeners)))
+
+        async def notify(update: Dict):
+            pending[:] = [update]
+            wakeup.set()
+
+        delivery = asyncio.ensure_future(deliver())
+        try:
+            result = await self._run_check(statement, overfetch_factor, embeddings, notify)
+        finally:
+            # The final result supersedes any update still waiting
+            delivery.cancel()
+        print(f"Embedding cache for this check: {embeddings.stats()}")
+        # Only completed analyses carry fetch timings; failed searches and scrapes are
+        # usually transient and should be retried rather than cached
+        if "fetch_timings" in result:
+            self.verdict_cache.put(statement_embedding, result, statement)
+        print(f"Verdict cache: {self.verdict_cache.stats()}")
+        return result
+
+    async def _run_check(self, statement: str, overfetch_factor: float, embeddings: EmbeddingCache,
+                         on_update=None) -> Dict:
+        try:
+            local_sources = await self._local_sources(statement, embeddings)
+            if local_sources:
+                print(f"\nAnswering from {len(local_sources)} locally indexed sources")
+                return await self._finish_analysis(statement, local_sources, [], embeddings, on_update)
+
             print("\nSearching for relevant information...")
-            regular_results = list(self.search_engine.text(
-                statement,
-                max_results=3
-            ))
+            # Run the plain and the fact-check search side by side
+            regular_results, debunk_results = await asyncio.gather(
+                self._search(statement, max_results=3),
+                self._search(f"fact check {statement}", max_results=2)
+            )
             print(f"Found {len(regular_results)} regular search results")
-            
-            debunk_results = list(self.search_engine.text(
-                f"fact check {statement}",
-                max_results=2
-            ))
             print(f"Found {len(debunk_results)} fact-check results")
             
             all_results = regular_results + debunk_results
@@ -254,7 +793,8 @@ class OllamaFactChecker:
                 url = result.get('link') or result.get('href')
                 print(f"- {url or 'No URL found'}")
 
-            analysis_result = self._analyze_sources(statement, all_results)
+            analysis_result = await self._analyze_sources(statement, all_results, overfetch_factor, embeddings,
+                                                          on_update)
             return analysis_result
             
         except Exception as e:
@@ -266,43 +806,51 @@ class OllamaFactChecker:
             }
 
 
-    def _extract_text_from_url(self, url: str) -> str:
+    async def _extract_text_from_url(self, url: str) -> str:
+        # Checks running side by side often land on the same page; download and parse it once
+        return await self._page_fetches.run(url, lambda: self._download_text(url))
+
+    async def _download_text(self, url: str) -> str:
         try:
+            cached = await asyncio.to_thread(self.page_cache.get, url)
+            if cached is not None and cached["fresh"]:
+                print(f"\nUsing cached text for: {url}")
+                return cached["content"]
+
             print(f"\nAttempting to extract text from: {url}")
-            response = requests.get(url, headers=self.headers, timeout=10)
+            headers = dict(self.headers)
+            if cached is not None:
+                # Stale entry: ask the server whether the page changed since we stored it
+                if cached["etag"]:
+                    headers['If-None-Match'] = cached["etag"]
+                if cached["last_modified"]:
+                    headers['If-Modified-Since'] = cached["last_modified"]
+
+            started_at = time.perf_counter()
+            # Article text sits near the top of the page, so stop downloading at the byte budget
+            response, body = await self.http.get_capped(url, self.max_page_bytes, headers=headers, timeout=10)
+            if cached is not None and response.status_code == 304:
+                print(f"Cached text still valid for: {url}")
+                await asyncio.to_thread(self.page_cache.mark_revalidated, url)
+                return cached["content"]
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # Try different content extraction strategies
-            content = ""
-            
-            # Strategy 1: Look for article or main content
-            main_content = soup.find(['article', 'main', 'div[role="main"]'])
-            if main_content:
-                content = main_content.get_text(strip=True, separator=' ')
-            
-            # Strategy 2: If no main content, get all paragraphs
-            if not content:
-                paragraphs = soup.find_all('p')
-                content = ' '.join(p.get_text(strip=True) for p in paragraphs)
-            
-            # Strategy 3: If still no content, get all text from body
-            if not content:
-                content = soup.body.get_text(strip=True, separator=' ') if soup.body else ''
-            
-            # Clean up the text
-            content = re.sub(r'\s+', ' ', content).strip()
+            # Parsing is CPU-bound, keep it off the event loop
+            content = await self._extract(body, response.charset_encoding or 'utf-8')
+            await asyncio.to_thread(
+                self.page_cache.put,
+                url,
+                content,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                cost=time.perf_counter() - started_at
+            )
             
             if content:
                 print(f"Successfully extracted {len(content)} characters")
                 # Print the first 100 characters as preview
                 print(f"Preview: {content[:100]}...")
-                return content[:8000]
+                return content
             else:
                 print("No content extracted")
                 return ""
@@ -311,12 +859,64 @@ class OllamaFactChecker:
             print(f"Error scraping {url}: {str(e)}")
             return ""
 
-    def _analyze_sources(self, statement: str, results: List[Dict]) -> Dict:
+    async def _local_sources(self, statement: str, embeddings: EmbeddingCache) -> List[Dict]:
+        """Build sources from the evidence index, or return [] if local recall is too thin."""
+        statement_embedding = (await self._encode_cached([statement], embeddings))[0]
+        passages = await asyncio.to_thread(
+            self.evidence_index.search, statement_embedding, 50, self.local_min_similarity
+        )
+
+        # Group passages by page, best page first, keeping one page per domain
+        passages_by_url = {}
+        domains = set()
+        for passage in passages:
+            if passage["url"] not in passages_by_url:
+                if passage["domain"] in domains or len(passages_by_url) >= 5:
+                    continue
+                domains.add(passage["domain"])
+                passages_by_url[passage["url"]] = []
+            passages_by_url[passage["url"]].append(passage)
+        if len(passages_by_url) < self.local_min_sources:
+            return []
+
+        sources_data = []
+        for url, url_passages in passages_by_url.items():
+            sentences = [p["text"] for p in url_passages[:5]]
+            # The index already holds these vectors, so the summary stage needn't re-encode
+            for passage in url_passages[:5]:
+                embeddings.put(passage["text"], passage["vector"])
+            sources_data.append({
+                "domain": url_passages[0]["domain"],
+                "url": url,
+                "content": '. '.join(sentences) + '.',
+                "title": ""
+            })
+        return sources_data
+
+    async def _index_evidence(self, url: str, domain: str, content: str, embeddings: EmbeddingCache):
+        sentences = self._split_sentences(content)
+        if not sentences:
+            return
+        # Already encoded by the per-source summary, so these are cache hits
+        vectors = await self._encode_cached(sentences, embeddings)
+        self.evidence_index.add(url, domain, sentences, vectors)
+        self._evidence_unsaved += 1
+        if self._evidence_unsaved >= self.evidence_save_every:
+            self._evidence_unsaved = 0
+            await asyncio.to_thread(self.evidence_index.save)
+
+    @staticmethod
+    def _has_enough_content(content: str) -> bool:
+        return bool(content and len(content.strip()) > 100)
+
+    async def _analyze_sources(self, statement: str, results: List[Dict], overfetch_factor: float = 1.0,
+                               embeddings: Optional[EmbeddingCache] = None, on_update=None) -> Dict:
         sources_data = []
+        fetch_timings = []  # Per-URL queue and fetch times
         processed_urls = set()  # Track processed URLs
         processed_domains = set()  # Track processed domains
         desired_source_count = min(5, len(results))  # Cap at 5 sources maximum
-        max_search_attempts = 15  # Limit total search attempts
+        max_search_attempts = 15  # Limit total fetch attempts
         search_attempts = 0
         
         print(f"\nAiming to find {desired_source_count} valid sources")
@@ -335,79 +935,122 @@ class OllamaFactChecker:
         
         # Initial results
         all_results = results.copy()  # Create a copy of initial results
+
+        # Hedging needs spare candidates in the first wave; the initial searches return
+        # about as many as we want sources, so run the variations now rather than only
+        # once the list runs dry
+        wanted_candidates = math.ceil(desired_source_count * overfetch_factor)
+        if overfetch_factor > 1 and len(all_results) < wanted_candidates:
+            current_keyword_index = len(search_keywords)
+            print(f"\nSearching for {wanted_candidates - len(all_results)} spare candidates to hedge with")
+            all_results.extend(await self._search_many(
+                search_keywords,
+                max_results=5,
+                wanted_urls=wanted_candidates - len(all_results),
+                exclude={result.get('link') or result.get('href') for result in all_results}
+            ))
         
         while len(sources_data) < desired_source_count and search_attempts < max_search_attempts:
-            search_attempts += 1
+            # Pick the next wave of candidates to fetch together, at most one per domain
+            batch = []
+            batch_domains = set()
+            deferred = []  # Same-domain candidates kept in case the one in flight fails
+            needed = desired_source_count - len(sources_data)
+            # When hedging, fetch extra candidates and keep whichever finish first
+            wave_size = max(needed, math.ceil(needed * overfetch_factor))
+            while all_results and len(batch) < wave_size and search_attempts + len(batch) < max_search_attempts:
+                result = all_results.pop(0)
+                
+                url = result.get('link') or result.get('href')
+                if not url:
+                    print(f"No URL found in result: {result}")
+                    continue
+
+                # Skip if we've already processed this URL
+                if url in processed_urls:
+                    print(f"Skipping duplicate URL: {url}")
+                    continue
+
+                domain = urlparse(url).netloc
+                if domain in batch_domains:
+                    deferred.append(result)
+                    continue
+
+                # Add URL to processed set
+                processed_urls.add(url)
+
+                if self.is_blacklisted(url):
+                    print(f"Skipping blacklisted domain: {url}")
+                    continue
+
+                # Skip if we've already processed this domain
+                if domain in processed_domains:
+                    print(f"Skipping duplicate domain: {domain}")
+                    continue
+
+                batch.append((url, domain, result))
+                batch_domains.add(domain)
+            all_results = deferred + all_results
             
             # If we need more results, try another search
-            if not all_results:
+            if not batch:
+                if all_results:
+                    break
                 if current_keyword_index >= len(search_keywords):
                     print("No more search variations available")
                     break
                     
-                print(f"\nTrying alternative search: {search_keywords[current_keyword_index]}")
-                try:
-                    new_results = list(self.search_engine.text(
-                        search_keywords[current_keyword_index],
-                        max_results=5
-                    ))
-                    current_keyword_index += 1
-                    
-                    if new_results:
-                        # Filter out any results we've already seen
-                        new_results = [r for r in new_results 
-                                     if (r.get('link') or r.get('href')) not in processed_urls]
-                        all_results.extend(new_results)
-                        print(f"Found {len(new_results)} additional unique results")
-                    else:
-                        print("No additional results found")
-                        current_keyword_index += 1
-                        continue
-                except Exception as e:
-                    print(f"Search error: {e}")
-                    current_keyword_index += 1
-                    continue
-            
-            if not all_results:
-                print("No more results available")
-                break
-                
-            # Get next result and remove it from the list
-            result = all_results.pop(0)
-            
-            url = result.get('link') or result.get('href')
-            if not url:
-                print(f"No URL found in result: {result}")
+                # Fan out the remaining variations at once and stop once we have enough new URLs
+                remaining_keywords = search_keywords[current_keyword_index:]
+                current_keyword_index = len(search_keywords)
+                print(f"\nTrying {len(remaining_keywords)} alternative searches")
+                new_results = await self._search_many(
+                    remaining_keywords,
+                    max_results=5,
+                    wanted_urls=2 * (desired_source_count - len(sources_data)),
+                    exclude=processed_urls
+                )
+                if new_results:
+                    all_results.extend(new_results)
+                    print(f"Found {len(new_results)} additional unique results")
+                else:
+                    print("No additional results found")
                 continue
-
-            # Skip if we've already processed this URL
-            if url in processed_urls:
-                print(f"Skipping duplicate URL: {url}")
-                continue
-
-            # Add URL to processed set
-            processed_urls.add(url)
-
-            if self.is_blacklisted(url):
-                print(f"Skipping blacklisted domain: {url}")
-                continue
-
-            domain = urlparse(url).netloc
             
-            # Skip if we've already processed this domain
-            if domain in processed_domains:
-                print(f"Skipping duplicate domain: {domain}")
-                continue
-
-            print(f"\nProcessing source {len(sources_data) + 1}/{desired_source_count}")
-            print(f"Processing: {url}")
+            print(f"\nFetching {len(batch)} sources concurrently ({len(sources_data)}/{desired_source_count} found so far)")
+            search_attempts += len(batch)
+            fetches = await self.source_fetcher.fetch_until(
+                (url for url, _, _ in batch),
+                wanted=needed,
+                is_useful=self._has_enough_content
+            )
+            fetches_by_url = {fetch["url"]: fetch for fetch in fetches}
             
-            full_content = self._extract_text_from_url(url)
+            successes = []
+            for url, domain, result in batch:
+                fetch = fetches_by_url[url]
+                full_content = fetch["content"]
+                ok = self._has_enough_content(full_content)
+                fetch_timings.append({
+                    "url": url,
+                    "wait_time": fetch["wait_time"],
+                    "fetch_time": fetch["fetch_time"],
+                    "ok": ok,
+                    "cancelled": fetch["cancelled"]
+                })
+                if fetch["cancelled"]:
+                    print(f"Cancelled slow fetch: {url}")
+                elif ok and len(successes) < needed:
+                    successes.append((url, domain, result, full_content))
+                elif not ok:
+                    print(f"Insufficient content extracted from: {url}")
             
-            if full_content and len(full_content.strip()) > 100:
-                # First summarization - per source
-                summarized_content = self.summarize_content(statement, full_content)
-                
+            # First summarization - per source
+            summaries = await asyncio.gather(
+                *(self.summarize_content(statement, full_content, embeddings=embeddings)
+                  for _, _, _, full_content in successes)
+            )
+            for (url, domain, result, full_content), summarized_content in zip(successes, summaries):
                 source_data = {
                     "domain": domain,
                     "url": url,
@@ -419,11 +1062,15 @@ class OllamaFactChecker:
                 print(f"Successfully added source: {domain}")
                 print(f"Summarized content length: {len(summarized_content)} characters")
                 print(f"Original content length: {len(full_content)} characters")
-            else:
-                print(f"Insufficient content extracted from: {url}")
-            
-            time.sleep(1)
+                await self._index_evidence(url, domain, full_content, embeddings)
 
+        if fetch_timings:
+            print(format_fetch_timings(fetch_timings))
+
+        return await self._finish_analysis(statement, sources_data, fetch_timings, embeddings, on_update)
+
+    async def _finish_analysis(self, statement: str, sources_data: List[Dict], fetch_timings: List[Dict],
+                               embeddings: Optional[EmbeddingCache] = None, on_update=None) -> Dict:
         if not sources_data:
             print("\nNo valid content could be extracted from any sources")
             return {
@@ -435,12 +1082,12 @@ class OllamaFactChecker:
         print(f"\nSuccessfully processed {len(sources_data)} unique sources with content")
         
         # Second summarization - combine and summarize all sources together
-        final_summary = self.summarize_combined_content(statement, sources_data)
+        final_summary = await self.summarize_combined_content(statement, sources_data, embeddings=embeddings)
         print("Final summarized content length:", len(final_summary))
         print(final_summary)
         
         # Create analysis using the final summary
-        analysis = self._analyze_with_ollama(statement, final_summary)
+        analysis = await self._analyze_with_ollama(statement, final_summary, on_update)
         sources = [s["url"] + "\n" for s in sources_data]
         sources = "\n".join(sources)
         
@@ -453,7 +1100,8 @@ Sources:\n{sources}"""
         response = {
             "statement": statement,
             "result": analysis['verdict'],
-            "explanation": combined_explanation
+            "explanation": combined_explanation,
+            "fetch_timings": fetch_timings
         }
         
         return response
@@ -472,8 +1120,86 @@ app.add_middleware(
 )
 checker = OllamaFactChecker()
 
+
+@app.exception_handler(NotReadyError)
+async def not_ready(request, e: NotReadyError):
+    # Still starting, or a component failed: ask the client to come back later, unless
+    # the component won't be retried
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(e), "component": e.component, "status": e.status, "retry_after": e.retry_after},
+        headers={"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after is not None else None
+    )
+
 class StatementRequest(BaseModel):
     statement: str
+    # Fetch this many times more candidate pages than needed and keep the fastest (1.0 = off)
+    overfetch_factor: Optional[float] = None
+    # WebSocket topic the result is published under on port 8000 (e.g. a session id); None = no topic
+    topic: Optional[str] = None
+
+# Fire-and-forget tasks, referenced here until they finish
+background_tasks: Set[asyncio.Task] = set()
+
+
+async def forward_result(result: Dict, topic: Optional[str] = None):
+    """Forward a finished fact check to the service running on port 8000."""
+    try:
+        forward_response = await checker.http.post(
+            "http://localhost:8000/send-fact-check",  # Changed to correct endpoint
+            json={**result, "topic": topic},
+            headers={"Content-Type": "application/json"},
+            timeout=10
+        )
+        forward_response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"Warning: Failed to forward result to port 8000: {e}")
+
+
+async def forward_update(update: Dict, topic: Optional[str] = None):
+    """Forward a partial fact check so WebSocket clients can show it before the verdict is final."""
+    try:
+        forward_response = await checker.http.post(
+            "http://localhost:8000/send-fact-check-update",
+            json={**update, "topic": topic},
+            timeout=2
+        )
+        forward_response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"Warning: Failed to forward update to port 8000: {e}")
+
+
+async def run_job(statement: str, options: Dict) -> Dict:
+    topic = options.get("topic")
+    result = await checker.check_statement(statement, options.get("overfetch_factor"),
+                                           lambda update: forward_update(update, topic))
+    await forward_result(result, topic)
+    return result
+
+
+jobs = JobQueue(run_job, workers=JOB_WORKERS, max_queued=JOB_QUEUE_SIZE)
+
+
+class JobRequest(StatementRequest):
+    # "interactive" for queries typed into the frontend, "background" for caption checks
+    priority: str = "background"
+
+
+def job_response(job: Dict) -> Dict:
+    response = {
+        "job_id": job["id"],
+        "status": job["status"],
+        "priority": job["priority"],
+        "created_at": job["created_at"]
+    }
+    if job["status"] == "queued":
+        response["position"] = jobs.position(job)
+    elif job["status"] == "done":
+        response["result"] = job["result"]
+    elif job["status"] == "failed":
+        response["error"] = job["error"]
+    return response
+
 
 @app.post("/check")
 async def check_statement(request: StatementRequest):
@@ -481,34 +1207,253 @@ async def check_statement(request: StatementRequest):
         if not request.statement.strip():
             raise HTTPException(status_code=400, detail="Statement cannot be empty")
             
-        # Get the fact check result
-        result = checker.check_statement(request.statement)
+        # Get the fact check result, pushing partial results to WebSocket clients as they stream in
+        result = await checker.check_statement(request.statement, request.overfetch_factor,
+                                               lambda update: forward_update(update, request.topic))
         
         # Forward the result to the service running on port 8000
-        try:
-            forward_response = requests.post(
-                "http://localhost:8000/send-fact-check",  # Changed to correct endpoint
-                json=result,
-                headers={"Content-Type": "application/json"}
-            )
-            forward_response.raise_for_status()
-            
-            # Return the result to the original caller as well
-            return result
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Warning: Failed to forward result to port 8000: {e}")
-            # Still return the result even if forwarding failed
-            return result
+        # Still return the result even if forwarding failed
+        await forward_result(result, request.topic)
+        return result
         
+    except (HTTPException, NotReadyError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class BatchRequest(BaseModel):
+    statements: List[str]
+    overfetch_factor: Optional[float] = None
+    # Answer statements that are not factual claims with "Not Checked" instead of checking them
+    skip_unworthy: bool = True
+    topic: Optional[str] = None
+
+
+@app.post("/check/batch")
+async def check_batch(request: BatchRequest):
+    """Check a list of statements (e.g. a transcript segment) with shared retrieval.
+
+    Returns {"results": [...]} in the order of `statements`; each result is also
+    forwarded to port 8000 as soon as it is ready.
+    """
+    statements = [s for s in request.statements if s.strip()]
+    if not statements:
+        raise HTTPException(status_code=400, detail="Statements cannot be empty")
+    if len(statements) > MAX_BATCH_STATEMENTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_STATEMENTS} statements per batch")
+
+    started_at = time.perf_counter()
+    results = await checker.check_batch(statements, request.overfetch_factor,
+                                        lambda result: forward_result(result, request.topic),
+                                        request.skip_unworthy)
+    return {
+        "results": results,
+        "unique_statements": len({normalize_statement(s) for s in statements}),
+        "elapsed": time.perf_counter() - started_at
+    }
+
+
+@app.post("/check/stream")
+async def check_statement_stream(request: StatementRequest):
+    """Like /check, but responds with newline-delimited JSON events.
+
+    Zero or more {"type": "update", ...} events carry the verdict and a growing
+    explanation while the model is still writing, followed by one {"type": "result", ...}
+    or {"type": "error", "detail": ...} event.
+    """
+    if not request.statement.strip():
+        raise HTTPException(status_code=400, detail="Statement cannot be empty")
+
+    events = asyncio.Queue()
+
+    async def on_update(update: Dict):
+        events.put_nowait({"type": "update", **update})
+        await forward_update(update, request.topic)
+
+    async def run():
+        try:
+            result = await checker.check_statement(request.statement, request.overfetch_factor, on_update)
+            await forward_result(result, request.topic)
+            events.put_nowait({"type": "result", **result})
+        except Exception as e:
+            events.put_nowait({"type": "error", "detail": str(e)})
+
+    # The check keeps running if the caller disconnects, so WebSocket clients still get it;
+    # the event loop only keeps weak references to tasks, so hold on to it until it is done
+    task = asyncio.ensure_future(run())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+    async def stream():
+        while True:
+            event = await events.get()
+            yield json.dumps(event) + "\n"
+            if event["type"] != "update":
+                break
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """Queue a fact check and return its job id right away.
+
+    Poll GET /jobs/{job_id} for the result; it is also forwarded to port 8000 like /check
+    results. Responds 429 with a Retry-After header when the queue is full.
+    """
+    if not request.statement.strip():
+        raise HTTPException(status_code=400, detail="Statement cannot be empty")
+    if request.priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {list(PRIORITIES)}")
+    priority = request.priority
+    score = None
+    if priority == "background":
+        # Background statements that don't look like claims only run when nothing else waits
+        score = (await checker.score_worthiness([request.statement]))[0]
+        if score < checker.worthiness_threshold:
+            priority = "low"
+    try:
+        job = jobs.submit(request.statement, priority, overfetch_factor=request.overfetch_factor,
+                          topic=request.topic)
+    except QueueFullError as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e), "retry_after": e.retry_after},
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    return {**job_response(job), "check_worthiness": score}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id")
+    return job_response(job)
+
+
+captions = CaptionSessions()
+caption_segmenter_task = None
+
+
+async def load_caption_segmenter():
+    """Segment new caption sessions with spaCy once the model is loaded."""
+    try:
+        from sentence_segmenter import load_pipeline
+        captions.nlp = await asyncio.to_thread(load_pipeline, CAPTION_SEGMENTER_MODEL)
+        print(f"Caption segmenter loaded: {CAPTION_SEGMENTER_MODEL}")
+    except (ImportError, OSError) as e:
+        print(f"Caption segmenter unavailable, cutting captions at punctuation: {e}")
+
+
+class CaptionRequest(BaseModel):
+    text: str
+    # Set on the last capture of a stream to flush the pending words
+    final: bool = False
+
+
+async def queue_spans(session_id: str, spans: List[str]) -> List[Dict]:
+    """Queue claim spans as background jobs, published under the caption session's topic."""
+    queued = []
+    scores = await checker.score_worthiness(spans)
+    for span, score in zip(spans, scores):
+        if score < checker.worthiness_threshold:
+            checker.worthiness.record_skipped()
+            queued.append({"statement": span, "job_id": None, "skipped": True, "check_worthiness": score})
+            continue
+        try:
+            job = jobs.submit(span, "background", topic=session_id)
+            queued.append({"statement": span, "job_id": job["id"], "check_worthiness": score})
+        except QueueFullError as e:
+            # Caption checks are best effort; the caller can resubmit through /jobs
+            queued.append({"statement": span, "job_id": None, "retry_after": e.retry_after,
+                           "check_worthiness": score})
+    return queued
+
+
+@app.post("/captions/{session_id}")
+async def ingest_captions(session_id: str, http_request: Request):
+    """Feed caption text for a stream; only newly completed claim spans are checked.
+
+    Captures may overlap earlier ones, as a scrolling caption window does. Each
+    completed span that looks like a factual claim is queued as a background job, the
+    others are returned with "skipped": true. Spans covered by recent checks are
+    reported under "dropped" and not checked again. Results are published on the
+    port 8000 WebSocket under the topic `session_id`.
+
+    The body is a CaptionRequest as JSON, whatever the Content-Type: the extension
+    flushes the last capture with navigator.sendBeacon, which sends text/plain.
+    """
+    try:
+        request = CaptionRequest(**json.loads(await http_request.body()))
+    except (ValueError, TypeError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid caption request: {e}")
+    # Wait before the session takes the text in, so no span is consumed that can't be queued
+    await checker.wait_worthiness()
+    result = captions.ingest(session_id, request.text, request.final)
+    return {"spans": await queue_spans(session_id, result["spans"]), "dropped": result["dropped"]}
+
+
+@app.delete("/captions/{session_id}")
+async def close_captions(session_id: str):
+    await checker.wait_worthiness()
+    result = captions.close(session_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Unknown caption session")
+    return {"spans": await queue_spans(session_id, result["spans"]), "dropped": result["dropped"]}
+
+
+@app.on_event("startup")
+async def startup():
+    # Returns at once: models and Ollama load in the background, see /ready
+    global caption_segmenter_task
+    checker.start()
+    jobs.start()
+    if CAPTION_SEGMENTER_MODEL:
+        caption_segmenter_task = asyncio.create_task(load_caption_segmenter())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await jobs.stop()
+    await checker.aclose()
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "verdict_cache": checker.verdict_cache.stats(),
+        "page_cache": await asyncio.to_thread(checker.page_cache.stats) if checker.page_cache else None,
+        "search_cache": checker.search_cache.stats(),
+        "embedding_cache": checker.embedding_cache.stats() if checker.embedding_cache else None,
+        "embedding_engine": {"backend": checker.embedding_backend, **checker.embedding_engine.stats()},
+        "evidence_index": checker.evidence_index.stats(),
+        "http": checker.http.stats(),
+        "shared_searches": checker._searches.stats(),
+        "shared_page_fetches": checker._page_fetches.stats(),
+        "jobs": jobs.stats(),
+        "captions": captions.stats(),
+        "check_worthiness": checker.worthiness.stats() if checker.worthiness else None,
+        "readiness": checker.readiness.stats()
+    }
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+
+@app.get("/ready")
+async def ready():
+    """Readiness of each background-loaded component; 503 until all of them are ready.
+
+    Unlike /health, which answers as soon as the server is up, use this to decide
+    when to send traffic to the instance.
+    """
+    stats = checker.readiness.stats()
+    return JSONResponse(status_code=200 if stats["ready"] else 503, content=stats)
+
 if __name__ == "__main__":
     print("Starting Fact Checker Server...")
     uvicorn.run(app, host="0.0.0.0", port=8004)
\ No newline at end of file
@@ -0,0 +1,67 @@
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Sentence embeddings keyed by a hash of the sentence text.
+
+    A request-scoped cache is usually unbounded and chained to a bounded process-wide
+    `parent`, so lookups fall through to the parent and new vectors are stored in both.
+    Caches can be chained further (check -> batch -> process) the same way.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, parent: Optional["EmbeddingCache"] = None):
+        self.max_entries = max_entries
+        self.parent = parent
+        self._vectors: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _get(self, key: bytes) -> Optional[np.ndarray]:
+        vector = self._vectors.get(key)
+        if vector is not None:
+            self._vectors.move_to_end(key)
+            self.hits += 1
+            return vector
+        if self.parent is not None:
+            vector = self.parent._get(key)
+            if vector is not None:
+                self._store(key, vector)
+                self.hits += 1
+                return vector
+        self.misses += 1
+        return None
+
+    def _store(self, key: bytes, vector: np.ndarray):
+        self._vectors[key] = vector
+        self._vectors.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        return self._get(self._key(text))
+
+    def put(self, text: str, vector: np.ndarray):
+        key = self._key(text)
+        self._store(key, vector)
+        parent = self.parent
+        while parent is not None:
+            parent._store(key, vector)
+            parent = parent.parent
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._vectors),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,128 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Dict, List
+
+import numpy as np
+
+
+class EmbeddingEngine:
+    """Micro-batches encode requests from concurrent checks into shared forward passes.
+
+    Requests wait at most `max_wait` seconds for company, and a batch is closed early once
+    it holds `max_batch_size` sentences. A single request larger than that still runs as
+    one batch. Forward passes run one at a time on `executor`, so requests arriving during
+    a pass are collected into the next batch.
+    """
+
+    def __init__(self, model, executor: Executor, max_batch_size: int = 128, max_wait: float = 0.005):
+        self.model = model
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = None
+        self._worker = None
+        self._carry = None  # Request that did not fit in the previous batch
+        self.requests = 0
+        self.batches = 0
+        self.sentences = 0
+        self.largest_batch = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_batch_time = 0.0
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def encode(self, sentences: List[str]) -> np.ndarray:
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put_nowait((list(sentences), future, loop.time()))
+        return await future
+
+    async def _next_request(self, timeout: float):
+        if self._carry is not None:
+            request, self._carry = self._carry, None
+            return request
+        if timeout is None:
+            return await self._queue.get()
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        if timeout <= 0:
+            return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._next_request(None)]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                request = await self._next_request(deadline - loop.time())
+                if request is None:
+                    break
+                if size + len(request[0]) > self.max_batch_size:
+                    self._carry = request
+                    break
+                batch.append(request)
+                size += len(request[0])
+            await self._encode_batch(batch)
+
+    async def _encode_batch(self, batch: List[tuple]):
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        texts = [sentence for sentences, _, _ in batch for sentence in sentences]
+
+        self.requests += len(batch)
+        self.batches += 1
+        self.sentences += len(texts)
+        self.largest_batch = max(self.largest_batch, len(texts))
+        for _, _, queued_at in batch:
+            wait = started_at - queued_at
+            self.total_queue_wait += wait
+            self.max_queue_wait = max(self.max_queue_wait, wait)
+
+        try:
+            vectors = await loop.run_in_executor(
+                self.executor,
+                lambda: self.model.encode(texts, batch_size=max(len(texts), 1), show_progress_bar=False)
+            )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.total_batch_time += loop.time() - started_at
+
+        offset = 0
+        for sentences, future, _ in batch:
+            if not future.done():
+                future.set_result(vectors[offset:offset + len(sentences)])
+            offset += len(sentences)
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "sentences": self.sentences,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "avg_batch_size": self.sentences / self.batches if self.batches else 0.0,
+            "avg_requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "avg_queue_wait_ms": 1000 * self.total_queue_wait / self.requests if self.requests else 0.0,
+            "max_queue_wait_ms": 1000 * self.max_queue_wait,
+            "avg_batch_time_ms": 1000 * self.total_batch_time / self.batches if self.batches else 0.0
+        }
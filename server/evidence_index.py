@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class EvidenceIndex:
+    """Persistent, bounded vector index of scraped sentence-level passages.
+
+    Vectors are unit-normalized rows of one NumPy matrix, so a query is a single
+    matrix-vector product; at the few tens of thousands of passages we keep, brute
+    force is as fast as an approximate index and exact. Each passage remembers its
+    source URL, domain and fetch time.
+
+    Re-adding a URL replaces its passages. Passages older than `max_age` are ignored
+    and, together with the oldest passages once `max_passages` is exceeded, dropped.
+    Dropped rows are only masked out until they make up a quarter of the matrix, at
+    which point it is compacted.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_passages: int = 50000,
+                 max_age: float = 7 * 24 * 3600, load: bool = True):
+        self.path = path
+        self.max_passages = max_passages
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._valid = np.zeros(0, dtype=bool)
+        self._fetched_at = np.zeros(0, dtype=np.float64)
+        self._texts: List[str] = []
+        self._urls: List[str] = []
+        self._domains: Dict[str, str] = {}
+        self._rows_by_url: Dict[str, List[int]] = {}
+        self._count = 0
+        self._live = 0
+        self._dirty = False
+        if load:
+            self.load()
+
+    def _grow(self, needed: int, dim: int):
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if self._count + needed <= capacity:
+            return
+        new_capacity = max(1024, capacity * 2, self._count + needed)
+        vectors = np.zeros((new_capacity, dim), dtype=np.float32)
+        valid = np.zeros(new_capacity, dtype=bool)
+        fetched_at = np.zeros(new_capacity, dtype=np.float64)
+        if self._vectors is not None:
+            vectors[:self._count] = self._vectors[:self._count]
+            valid[:self._count] = self._valid[:self._count]
+            fetched_at[:self._count] = self._fetched_at[:self._count]
+        self._vectors, self._valid, self._fetched_at = vectors, valid, fetched_at
+
+    def _drop_rows(self, rows):
+        for row in rows:
+            if self._valid[row]:
+                self._valid[row] = False
+                self._live -= 1
+
+    def _drop_url(self, url: str):
+        self._drop_rows(self._rows_by_url.pop(url, []))
+        self._domains.pop(url, None)
+
+    def add(self, url: str, domain: str, passages: List[str], vectors: np.ndarray,
+            fetched_at: Optional[float] = None):
+        if not passages:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        fetched_at = time.time() if fetched_at is None else fetched_at
+
+        with self._lock:
+            self._drop_url(url)
+            self._grow(len(passages), vectors.shape[1])
+            start, end = self._count, self._count + len(passages)
+            self._vectors[start:end] = vectors
+            self._valid[start:end] = True
+            self._fetched_at[start:end] = fetched_at
+            self._texts.extend(passages)
+            self._urls.extend([url] * len(passages))
+            self._domains[url] = domain
+            self._rows_by_url[url] = list(range(start, end))
+            self._count = end
+            self._live += len(passages)
+            self._evict()
+            self._dirty = True
+
+    def _evict(self):
+        cutoff = time.time() - self.max_age
+        live = self._valid[:self._count]
+        self._drop_rows(np.flatnonzero(live & (self._fetched_at[:self._count] < cutoff)))
+        if self._live > self.max_passages:
+            # Drop whole sources, oldest first, until we are back under the bound
+            by_age = sorted(self._rows_by_url, key=lambda u: self._fetched_at[self._rows_by_url[u][0]])
+            for url in by_age:
+                if self._live <= self.max_passages:
+                    break
+                self._drop_url(url)
+        for url in [u for u, rows in self._rows_by_url.items() if not self._valid[rows[0]]]:
+            self._drop_url(url)
+        if self._count and self._live < 0.75 * self._count:
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self._valid[:self._count])
+        self._vectors[:len(keep)] = self._vectors[keep]
+        self._fetched_at[:len(keep)] = self._fetched_at[keep]
+        self._valid[:] = False
+        self._valid[:len(keep)] = True
+        self._texts = [self._texts[i] for i in keep]
+        self._urls = [self._urls[i] for i in keep]
+        self._rows_by_url = {}
+        for row, url in enumerate(self._urls):
+            self._rows_by_url.setdefault(url, []).append(row)
+        self._count = len(keep)
+
+    def search(self, query: np.ndarray, k: int = 25, min_similarity: float = 0.0) -> List[Dict]:
+        """Return up to `k` live passages most similar to `query`, best first."""
+        query = np.asarray(query, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        with self._lock:
+            if not self._live:
+                return []
+            similarities = self._vectors[:self._count] @ query
+            cutoff = time.time() - self.max_age
+            usable = self._valid[:self._count] & (self._fetched_at[:self._count] >= cutoff)
+            similarities[~usable] = -np.inf
+            k = min(k, self._count)
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top])]
+            return [
+                {
+                    "text": self._texts[i],
+                    "url": self._urls[i],
+                    "domain": self._domains[self._urls[i]],
+                    "fetched_at": float(self._fetched_at[i]),
+                    "similarity": float(similarities[i]),
+                    "vector": self._vectors[i].copy()
+                }
+                for i in top if similarities[i] >= min_similarity
+            ]
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            if self._vectors is None:
+                return
+            self._compact()
+            vectors = self._vectors[:self._count].copy()
+            metadata = {
+                "texts": list(self._texts),
+                "urls": list(self._urls),
+                "domains": dict(self._domains),
+                "fetched_at": self._fetched_at[:self._count].tolist()
+            }
+            self._dirty = False
+        # Write to temporary files and swap them in so a crash never leaves a torn index
+        with open(self.path + ".npy.tmp", "wb") as f:
+            np.save(f, vectors)
+        with open(self.path + ".json.tmp", "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(self.path + ".npy.tmp", self.path + ".npy")
+        os.replace(self.path + ".json.tmp", self.path + ".json")
+
+    def load(self):
+        """Read the saved index, if any; done by the constructor unless `load` is False."""
+        if self.path and os.path.exists(self.path + ".npy"):
+            with self._lock:
+                self._load()
+
+    def _load(self):
+        try:
+            vectors = np.load(self.path + ".npy")
+            with open(self.path + ".json", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load evidence index from {self.path}: {e}")
+            return
+        count = len(metadata["texts"])
+        if count == 0 or vectors.shape[0] != count:
+            return
+        self._vectors = vectors.astype(np.float32)
+        self._valid = np.ones(count, dtype=bool)
+        self._fetched_at = np.asarray(metadata["fetched_at"], dtype=np.float64)
+        self._texts = metadata["texts"]
+        self._urls = metadata["urls"]
+        self._domains = metadata["domains"]
+        for row, url in enumerate(self._urls):
+            self._rows_by_url.setdefault(url, []).append(row)
+        self._count = self._live = count
+        self._evict()
+        print(f"Loaded {self._live} evidence passages from {self.path}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "passages": self._live,
+                "sources": len(self._rows_by_url),
+                "rows": self._count,
+                "max_passages": self.max_passages
+            }
@@ -1,9 +1,11 @@
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Literal
+from typing import Literal, Optional
 import uvicorn
+import json
 import logging
+from broadcast_hub import BroadcastHub, WILDCARD
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -25,41 +27,88 @@ class FactCheck(BaseModel):
     statement: str
     result: Literal["Likely True", "Likely False", "Mostly False", "Partially False", "Unable to Verify"]
     explanation: str
+    # Stream the statement came from (e.g. a caption session id); only its subscribers receive it
+    topic: Optional[str] = None
 
-# Store active WebSocket connections
-active_connections: list[WebSocket] = []
+# Partial fact check streamed while the model is still answering; the verdict may not be known yet
+class FactCheckUpdate(BaseModel):
+    statement: str
+    result: Optional[str] = None
+    explanation: str = ""
+    topic: Optional[str] = None
+
+# Active WebSocket connections, each with its own outbound queue and sender task,
+# and the recent fact checks of each topic for clients that subscribe later
+hub = BroadcastHub()
+
+def subscribe(client, topic: str, replay: bool = True):
+    replayed = hub.subscribe(client, topic, replay)
+    # Sent after the backlog, so the client knows where live messages start
+    hub.send(client, {"type": "SUBSCRIBED", "topic": topic, "replayed": replayed})
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
+    """Push fact checks to the client.
+
+    Connect with ?topic=<id> (repeatable) to receive only those streams, and
+    ?replay=0 to skip their recent backlog; without a topic the client receives
+    every stream. Topics can be changed later by sending
+    {"type": "SUBSCRIBE" | "UNSUBSCRIBE", "topic": <id>, "replay": true}.
+    """
     await websocket.accept()
     logger.info("New WebSocket connection established")
-    active_connections.append(websocket)
+    client = hub.connect(websocket)
+    topics = websocket.query_params.getlist("topic")
+    replay = websocket.query_params.get("replay", "1") != "0"
+    if topics:
+        for topic in topics:
+            subscribe(client, topic, replay)
+    else:
+        # Existing clients don't send topics; they keep receiving everything, now with the recent backlog
+        hub.subscribe(client, WILDCARD, replay)
     try:
         while True:
-            # Keep the connection alive
             data = await websocket.receive_text()
-            logger.info(f"Received message: {data}")
+            try:
+                message = json.loads(data)
+            except ValueError:
+                message = None
+            if isinstance(message, dict) and message.get("type") == "SUBSCRIBE" and message.get("topic"):
+                subscribe(client, str(message["topic"]), bool(message.get("replay", True)))
+            elif isinstance(message, dict) and message.get("type") == "UNSUBSCRIBE" and message.get("topic"):
+                hub.unsubscribe(client, str(message["topic"]))
+            else:
+                logger.info(f"Received message: {data}")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
-        active_connections.remove(websocket)
+        await hub.disconnect(client)
         logger.info("WebSocket connection closed")
 
 @app.post("/send-fact-check")
 async def send_fact_check(fact_check: FactCheck):
     logger.info(f"Received new fact check: {fact_check}")
-    # Broadcast the fact check to all connected clients
-    for connection in active_connections:
-        try:
-            await connection.send_json({
-                "type": "NEW_FACT_CHECK",
-                "factCheck": fact_check.dict()
-            })
-            logger.info("Fact check sent successfully")
-        except Exception as e:
-            logger.error(f"Error sending fact check: {e}")
-            active_connections.remove(connection)
-    return {"status": "sent", "activeConnections": len(active_connections)}
+    # Queue the fact check for the subscribers of its topic; their sender tasks deliver it
+    queued = hub.broadcast({
+        "type": "NEW_FACT_CHECK",
+        "topic": fact_check.topic,
+        "factCheck": fact_check.dict(exclude={"topic"})
+    }, fact_check.topic)
+    return {"status": "sent", "activeConnections": len(hub), "queued": queued}
+
+@app.post("/send-fact-check-update")
+async def send_fact_check_update(update: FactCheckUpdate):
+    # Partial updates are superseded by the next one, so slow clients may skip some
+    queued = hub.broadcast({
+        "type": "FACT_CHECK_UPDATE",
+        "topic": update.topic,
+        "factCheck": update.dict(exclude={"topic"})
+    }, update.topic, droppable=True)
+    return {"status": "sent", "activeConnections": len(hub), "queued": queued}
+
+@app.get("/stats")
+async def stats():
+    return {"broadcast": hub.stats()}
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,93 @@
+import re
+
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+
+# Elements that never hold article text
+BOILERPLATE_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside']
+MAX_TEXT_LENGTH = 8000
+
+
+def _clean(content: str) -> str:
+    return re.sub(r'\s+', ' ', content).strip()[:MAX_TEXT_LENGTH]
+
+
+def extract_text(html: str) -> str:
+    """Extract the main text of a page with lxml.
+
+    Produces the same text as `extract_text_bs4`: boilerplate elements are dropped, then
+    the first <article>/<main> element is used, falling back to all paragraphs and then
+    the whole body. lxml's C parser tolerates pages cut off mid-document, so this also
+    works on downloads truncated at a byte budget.
+    """
+    try:
+        tree = lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        tree = lxml.html.document_fromstring(
+            html.encode('utf-8'), parser=lxml.html.HTMLParser(encoding='utf-8')
+        )
+    except etree.ParserError:
+        return ""
+
+    # Remove unwanted elements but keep the text that follows them
+    etree.strip_elements(tree, *BOILERPLATE_TAGS, with_tail=False)
+
+    def strings(element):
+        return [s.strip() for s in element.itertext() if s.strip()]
+
+    content = ""
+
+    # Strategy 1: Look for article or main content
+    main_content = next(tree.iter('article', 'main'), None)
+    if main_content is not None:
+        content = ' '.join(strings(main_content))
+
+    # Strategy 2: If no main content, get all paragraphs
+    if not content:
+        content = ' '.join(''.join(strings(p)) for p in tree.iter('p'))
+
+    # Strategy 3: If still no content, get all text from body
+    if not content:
+        body = tree.find('body')
+        content = ' '.join(strings(body)) if body is not None else ''
+
+    return _clean(content)
+
+
+def extract_text_from_bytes(body: bytes, encoding: str = 'utf-8') -> str:
+    """Decode a downloaded page and extract its text.
+
+    Meant to run in a parse worker process: the raw bytes go in and only the compact
+    cleaned text comes back, so no parse tree ever crosses the process boundary.
+    """
+    return extract_text(body.decode(encoding, errors='replace'))
+
+
+def extract_text_bs4(html: str) -> str:
+    """Reference extractor using BeautifulSoup's pure-Python html.parser."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Remove unwanted elements
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+
+    # Try different content extraction strategies
+    content = ""
+
+    # Strategy 1: Look for article or main content
+    main_content = soup.find(['article', 'main', 'div[role="main"]'])
+    if main_content:
+        content = main_content.get_text(strip=True, separator=' ')
+
+    # Strategy 2: If no main content, get all paragraphs
+    if not content:
+        paragraphs = soup.find_all('p')
+        content = ' '.join(p.get_text(strip=True) for p in paragraphs)
+
+    # Strategy 3: If still no content, get all text from body
+    if not content:
+        content = soup.body.get_text(strip=True, separator=' ') if soup.body else ''
+
+    return _clean(content)
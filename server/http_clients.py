@@ -0,0 +1,174 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientPool:
+    """Shared keep-alive HTTP clients for scraping, Ollama and result forwarding.
+
+    All async traffic goes through one httpx client whose connection pool is capped by
+    `max_connections`/`max_keepalive`; HTTP/2 is negotiated with hosts that support it
+    when the `h2` package is installed. httpx has no per-host limit, so requests to one
+    host are additionally gated to `per_host_limit` at a time, which also bounds the
+    connections a single host can hold. Blocking callers (startup probes) share a
+    pooled `requests.Session`.
+
+    Every request is traced to count new TCP connections per host, so `stats()` can
+    report how often connections are reused and how busy each host's slots are.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, per_host_limit: int = 6,
+                 keepalive_expiry: float = 30.0, http2: bool = True):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.per_host_limit = per_host_limit
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            print("h2 is not installed, HTTP/2 disabled (pip install 'httpx[http2]')")
+        self._client = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._host_stats: Dict[str, Dict] = {}
+        self.requests = 0
+        self.new_connections = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=per_host_limit)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=None,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry
+                )
+            )
+        return self._client
+
+    def _stats_for(self, host: str) -> Dict:
+        stats = self._host_stats.get(host)
+        if stats is None:
+            stats = self._host_stats[host] = {
+                "requests": 0,
+                "new_connections": 0,
+                "http2_responses": 0,
+                "in_flight": 0,
+                "peak_in_flight": 0,
+                "waited_for_slot": 0
+            }
+        return stats
+
+    def _forget_idle_hosts(self):
+        for host in [h for h, s in self._host_stats.items() if s["in_flight"] == 0]:
+            del self._host_stats[host]
+            self._host_slots.pop(host, None)
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str):
+        slot = self._host_slots.get(host)
+        if slot is None:
+            # Scraping touches many one-off hosts, so don't keep per-host state forever
+            if len(self._host_slots) >= 1024:
+                self._forget_idle_hosts()
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        stats = self._stats_for(host)
+        if slot.locked():
+            stats["waited_for_slot"] += 1
+        async with slot:
+            self.requests += 1
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+            try:
+                yield stats
+            finally:
+                stats["in_flight"] -= 1
+
+    def _extensions(self, stats: Dict, kwargs: Dict) -> Dict:
+        async def trace(event_name: str, info: Dict):
+            if event_name == "connection.connect_tcp.complete":
+                self.new_connections += 1
+                stats["new_connections"] += 1
+        return {**kwargs.pop("extensions", {}), "trace": trace}
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        async with self._host_slot(urlparse(url).netloc) as stats:
+            extensions = self._extensions(stats, kwargs)
+            response = await self.client().request(method, url, extensions=extensions, **kwargs)
+            if response.http_version == "HTTP/2":
+                stats["http2_responses"] += 1
+            return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs):
+        async with self._host_slot(urlparse(url).netloc) as stats:
+            extensions = self._extensions(stats, kwargs)
+            async with self.client().stream(method, url, extensions=extensions, **kwargs) as response:
+                if response.http_version == "HTTP/2":
+                    stats["http2_responses"] += 1
+                yield response
+
+    async def get_capped(self, url: str, max_bytes: int, **kwargs) -> Tuple[httpx.Response, bytes]:
+        """GET `url` but stop reading the body after `max_bytes`.
+
+        Returns the response (with its body unread) and the bytes received, so memory
+        per download stays bounded however large the page is.
+        """
+        async with self.stream("GET", url, **kwargs) as response:
+            body = bytearray()
+            if response.is_success:
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= max_bytes:
+                        del body[max_bytes:]
+                        break
+            return response, bytes(body)
+
+    def stats(self) -> Dict:
+        busiest = sorted(self._host_stats.items(), key=lambda item: item[1]["requests"], reverse=True)[:20]
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "connection_reuse_ratio": 1 - self.new_connections / self.requests if self.requests else 0.0,
+            "in_flight": sum(s["in_flight"] for s in self._host_stats.values()),
+            "max_connections": self.max_connections,
+            "per_host_limit": self.per_host_limit,
+            "http2_enabled": self.http2,
+            "hosts": {
+                host: {
+                    **stats,
+                    "slot_utilization": stats["in_flight"] / self.per_host_limit
+                }
+                for host, stats in busiest
+            }
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.session.close()
@@ -0,0 +1,154 @@
+import asyncio
+import itertools
+import math
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+# Lower number runs first
+PRIORITIES = {
+    "interactive": 0,  # someone is waiting on the frontend
+    "background": 1,   # caption windows from the extension
+    "low": 2           # background statements that don't look like factual claims
+}
+
+
+class QueueFullError(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class JobQueue:
+    """Runs fact-check jobs on a fixed pool of worker tasks.
+
+    Jobs are taken in priority order (FIFO within a class). Once `max_queued` jobs are
+    waiting, `submit` raises QueueFullError with a retry hint derived from recent job
+    durations instead of letting the backlog grow. Finished jobs are kept for
+    `result_ttl` seconds (at most `max_finished`) so clients can poll for them.
+    """
+
+    def __init__(self, handler: Callable[[str, Dict], Awaitable[Dict]], workers: int = 4,
+                 max_queued: int = 100, result_ttl: float = 600, max_finished: int = 1000):
+        self.handler = handler
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.max_finished = max_finished
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks = []
+        self._sequence = itertools.count()
+        self._jobs: Dict[str, Dict] = {}
+        self._finished: "OrderedDict[str, float]" = OrderedDict()  # job id -> finished_at
+        self._running = 0
+        self._avg_duration = 30.0  # seconds, moving average seeded with a typical check
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self):
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def retry_after(self) -> int:
+        """Rough seconds until a queue slot frees up."""
+        backlog = self._queue.qsize() + self._running if self._queue else 0
+        return max(1, math.ceil(backlog * self._avg_duration / self.workers))
+
+    def submit(self, statement: str, priority: str = "background", **options) -> Dict:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}, expected one of {list(PRIORITIES)}")
+        if self._queue.qsize() >= self.max_queued:
+            self.rejected += 1
+            raise QueueFullError(self.retry_after())
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "statement": statement,
+            "priority": priority,
+            "options": options,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None
+        }
+        self._jobs[job["id"]] = job
+        self._queue.put_nowait((PRIORITIES[priority], next(self._sequence), job["id"]))
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def position(self, job: Dict) -> Optional[int]:
+        """Number of queued jobs that will run before this one, or None if it left the queue."""
+        if job["status"] != "queued":
+            return None
+        waiting = list(self._queue._queue)
+        key = next(((p, s) for p, s, job_id in waiting if job_id == job["id"]), None)
+        if key is None:
+            return None
+        return sum(1 for p, s, _ in waiting if (p, s) < key)
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            self._running += 1
+            try:
+                job["result"] = await self.handler(job["statement"], job["options"])
+                job["status"] = "done"
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = str(e)
+                self.failed += 1
+            finally:
+                self._running -= 1
+                job["finished_at"] = time.time()
+                duration = job["finished_at"] - job["started_at"]
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+                self._finished[job_id] = job["finished_at"]
+                self._prune()
+
+    def _prune(self):
+        cutoff = time.time() - self.result_ttl
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if finished_at >= cutoff and len(self._finished) <= self.max_finished:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+
+    def stats(self) -> Dict:
+        queued_by_priority = {name: 0 for name in PRIORITIES}
+        if self._queue is not None:
+            names = {value: name for name, value in PRIORITIES.items()}
+            for priority, _, _ in list(self._queue._queue):
+                queued_by_priority[names[priority]] += 1
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "queued_by_priority": queued_by_priority,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_job_seconds": round(self._avg_duration, 2)
+        }
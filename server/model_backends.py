@@ -0,0 +1,68 @@
+"""Loaders for the CPU inference backends of the sentence encoder and Whisper.
+
+Every backend returns an object usable at the existing call sites: sentence encoders
+have SentenceTransformer's `encode`, and Whisper models work with the worker from
+`make_whisper_worker`. The heavy libraries are imported only for the backend in use.
+"""
+from typing import Optional
+
+SENTENCE_BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+WHISPER_BACKENDS = ("torch", "int8", "faster-whisper")
+
+# Quantized export shipped in the all-MiniLM-L6-v2 repository; AVX2 runs on any recent x86 CPU
+ONNX_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+def _quantize_linear_layers(model):
+    """Dynamic int8 quantization of every Linear layer, in place."""
+    import torch
+
+    # Subclasses of nn.Linear (Whisper defines its own) are not matched by the
+    # quantizer; on CPU they only add a dtype cast, so treat them as plain Linear
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+    torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
+
+
+def load_sentence_transformer(name: str = "all-MiniLM-L6-v2", backend: str = "torch"):
+    """torch: full precision (the previous behaviour); int8: dynamically quantized
+    Linear layers; onnx / onnx-int8: ONNX Runtime with the fp32 or quantized export
+    (needs `pip install sentence-transformers[onnx]`)."""
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(name)
+    if backend == "int8":
+        return _quantize_linear_layers(SentenceTransformer(name, device="cpu"))
+    if backend == "onnx":
+        return SentenceTransformer(name, backend="onnx")
+    if backend == "onnx-int8":
+        return SentenceTransformer(name, backend="onnx", model_kwargs={"file_name": ONNX_INT8_FILE})
+    raise ValueError(f"Unknown sentence encoder backend {backend!r}, expected one of {SENTENCE_BACKENDS}")
+
+
+def load_whisper(name: str = "base", backend: str = "torch", device: str = "cpu", cpu_threads: int = 0):
+    """torch: openai-whisper as before; int8: openai-whisper with dynamically quantized
+    Linear layers (CPU only); faster-whisper: CTranslate2 with int8 weights (needs
+    `pip install faster-whisper`)."""
+    if backend == "torch":
+        import whisper
+        return whisper.load_model(name).to(device)
+    if backend == "int8":
+        import whisper
+        return _quantize_linear_layers(whisper.load_model(name, device="cpu"))
+    if backend == "faster-whisper":
+        from faster_whisper import WhisperModel
+        return WhisperModel(name, device="cpu", compute_type="int8", cpu_threads=cpu_threads, num_workers=2)
+    raise ValueError(f"Unknown Whisper backend {backend!r}, expected one of {WHISPER_BACKENDS}")
+
+
+def make_whisper_worker(model, backend: str = "torch", fp16: bool = False, language: Optional[str] = None):
+    """The inference worker matching a model from `load_whisper`; `language` None detects it per window."""
+    if backend == "faster-whisper":
+        from whisper_worker import FasterWhisperWorker
+        return FasterWhisperWorker(model, language=language)
+    from whisper_worker import WhisperBatchWorker
+    return WhisperBatchWorker(model, language=language, fp16=fp16 and backend == "torch")
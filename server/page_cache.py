@@ -0,0 +1,133 @@
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+
+class PageCache:
+    """Persistent cache of extracted page text keyed by URL.
+
+    Text is zlib-compressed in a SQLite file so it survives restarts. Entries older than
+    `ttl` seconds are stale: they are not served directly, but their ETag/Last-Modified
+    validators let the caller revalidate with a conditional request. Once the stored
+    size exceeds `max_bytes`, the least recently used entries are dropped.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, ttl: float = 24 * 3600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                cost REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        # Fetch and parse time that cache hits did not have to spend again
+        self.seconds_saved = 0.0
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for `url` with a `fresh` flag, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, etag, last_modified, fetched_at, cost FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            content, etag, last_modified, fetched_at, cost = row
+            now = time.time()
+            fresh = now - fetched_at < self.ttl
+            if fresh:
+                self.hits += 1
+                self.seconds_saved += cost
+                self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+                self._conn.commit()
+            else:
+                self.misses += 1
+            return {
+                "content": zlib.decompress(content).decode('utf-8'),
+                "etag": etag,
+                "last_modified": last_modified,
+                "fresh": fresh
+            }
+
+    def mark_revalidated(self, url: str):
+        """Record a 304 response: the stored text is fresh again."""
+        with self._lock:
+            now = time.time()
+            row = self._conn.execute("SELECT cost FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            # The round trip still happened, but the download and parse did not
+            self.revalidated += 1
+            self.seconds_saved += row[0]
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self._conn.commit()
+
+    def put(self, url: str, content: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, cost: float = 0.0):
+        compressed = zlib.compress(content.encode('utf-8'))
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, compressed, len(compressed), etag, last_modified, now, now, cost)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        doomed = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "seconds_saved": round(self.seconds_saved, 3)
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+
+class NotReadyError(Exception):
+    """A component needed for the request has not started (yet).
+
+    `retry_after` is None when the component failed for good, so retrying won't help.
+    """
+
+    def __init__(self, component: str, status: str, retry_after: Optional[float] = 5.0):
+        super().__init__(f"{component} is not ready ({status})")
+        self.component = component
+        self.status = status
+        self.retry_after = retry_after
+
+
+class Readiness:
+    """Startup state of the components a service loads in the background.
+
+    Each component is "pending" until `run` starts loading it, then "loading", and
+    finally "ready" or "failed" (with the error). Requests that need a component
+    `wait` for it instead of failing while the service is still starting. A component
+    run with a `retry_interval` is loaded again that long after each failure.
+    """
+
+    def __init__(self, components: Iterable[str]):
+        self._components: Dict[str, Dict] = {name: {"status": "pending"} for name in components}
+        self._done = {name: asyncio.Event() for name in self._components}
+        self._retry_at: Dict[str, float] = {}
+        self.created_at = time.perf_counter()
+
+    async def run(self, name: str, load: Callable[[], None], retry_interval: Optional[float] = None) -> bool:
+        """Run the blocking `load` on a thread and record how it went; True if it succeeded.
+
+        With `retry_interval`, a failed load is retried after that many seconds until
+        it succeeds, so this only returns True.
+        """
+        component = self._components[name]
+        attempts = 0
+        while True:
+            component["status"] = "loading"
+            self._retry_at.pop(name, None)
+            # Requests arriving during a retry wait for it, as they do at startup
+            self._done[name].clear()
+            attempts += 1
+            started_at = time.perf_counter()
+            try:
+                await asyncio.to_thread(load)
+            except Exception as e:
+                component["status"] = "failed"
+                component["error"] = str(e)
+                print(f"Startup: {name} failed: {e}")
+            else:
+                component["status"] = "ready"
+                component.pop("error", None)
+                print(f"Startup: {name} ready in {time.perf_counter() - started_at:.1f} s")
+            component["seconds"] = round(time.perf_counter() - started_at, 3)
+            component["ready_after"] = round(time.perf_counter() - self.created_at, 3)
+            component["attempts"] = attempts
+            if component["status"] == "ready" or retry_interval is None:
+                self._done[name].set()
+                return component["status"] == "ready"
+            print(f"Startup: retrying {name} in {retry_interval:.0f} s")
+            self._retry_at[name] = time.perf_counter() + retry_interval
+            self._done[name].set()
+            await asyncio.sleep(retry_interval)
+
+    def fail(self, name: str, error: str):
+        """Mark a component that can't be loaded because something it depends on failed."""
+        self._components[name].update(status="failed", error=error)
+        self._done[name].set()
+
+    def is_ready(self, *names: str) -> bool:
+        return all(self._components[name]["status"] == "ready" for name in names or self._components)
+
+    def _retry_after(self, name: str) -> Optional[float]:
+        status = self._components[name]["status"]
+        if status != "failed":
+            return 5.0
+        if name not in self._retry_at:
+            return None
+        # Until the next attempt, which requests then wait for
+        return max(1.0, self._retry_at[name] - time.perf_counter())
+
+    async def wait(self, *names: str, timeout: Optional[float] = None):
+        """Wait until the components (default: all) are loaded; NotReadyError if one failed or is too slow."""
+        names = names or tuple(self._components)
+        if self.is_ready(*names):
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*(self._done[name].wait() for name in names)), timeout)
+        except asyncio.TimeoutError:
+            pass
+        for name in names:
+            status = self._components[name]["status"]
+            if status != "ready":
+                raise NotReadyError(name, status, self._retry_after(name))
+
+    def stats(self) -> Dict:
+        components = {name: dict(c) for name, c in self._components.items()}
+        for name, retry_at in self._retry_at.items():
+            components[name]["retry_in"] = round(max(0.0, retry_at - time.perf_counter()), 1)
+        return {"ready": self.is_ready(), "components": components}
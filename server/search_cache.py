@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from verdict_cache import normalize_statement
+
+
+class SearchCache:
+    """TTL cache of DDGS text results keyed by normalized query.
+
+    An entry stored for `max_results=5` also answers requests for fewer results. Writes
+    come from the search worker threads, so access is guarded by a lock.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 2048):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # query -> (max_results, results, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str, max_results: int) -> Optional[List[Dict]]:
+        key = normalize_statement(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_max, results, stored_at = entry
+                expired = time.monotonic() - stored_at > self.ttl
+                # A short result list means the search had nothing more to give
+                covers = stored_max >= max_results or len(results) < stored_max
+                if expired:
+                    del self._entries[key]
+                elif covers:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return results[:max_results]
+            self.misses += 1
+            return None
+
+    def put(self, query: str, max_results: int, results: List[Dict]):
+        key = normalize_statement(query)
+        with self._lock:
+            self._entries[key] = (max_results, results, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
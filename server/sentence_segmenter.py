@@ -0,0 +1,113 @@
+from typing import Iterable, List, Optional
+
+import spacy
+
+# Only the dependency parser (and the tok2vec layer it listens to) is needed for
+# sentence boundaries; the other en_core_web_sm pipes are never loaded
+UNUSED_PIPES = ["tagger", "attribute_ruler", "lemmatizer", "ner"]
+
+# Spoken transcripts chain clauses with these; a new segment starts before them
+SPLIT_WORDS = ("and", "but", "so", "because")
+# ...when the parser attaches them as a conjunction ("so" in "I think so" is not one)
+SPLIT_DEPS = {"cc", "mark"}
+
+
+def load_pipeline(model: str = "en_core_web_sm"):
+    """Load a spaCy model with only the pipes segmentation needs."""
+    return spacy.load(model, exclude=UNUSED_PIPES)
+
+
+class StreamingSentenceSegmenter:
+    """Splits unpunctuated transcript text into sentence-like segments.
+
+    Boundaries come from the spaCy parser, plus a split before a conjunction in
+    `split_words` once the running segment has `min_words`. Words are counted as
+    written, so "don't" is one word, not "do" and "n't". Segments are cut at
+    `max_words` so a missing boundary can't grow one without limit. Segments keep
+    the original text (e.g. "don't", not "do n't").
+
+    `feed` is incremental: the last, possibly unfinished segment is carried over and
+    re-parsed together with the next chunk, everything before it is emitted once and
+    never parsed again. The carry-over is at most `max_words` words, so the cost of a
+    chunk does not grow with the length of the stream. Chunks are buffered until
+    `parse_min_words` new words have arrived, so short caption lines don't each pay
+    for re-parsing the carry-over. `segment_many` pushes whole transcripts through
+    `nlp.pipe` in batches.
+    """
+
+    def __init__(self, model: str = "en_core_web_sm", split_words: Iterable[str] = SPLIT_WORDS,
+                 min_words: int = 4, max_words: int = 40, parse_min_words: int = 16, nlp=None):
+        self.nlp = nlp if nlp is not None else load_pipeline(model)
+        self.split_words = {word.lower() for word in split_words}
+        self.min_words = min_words
+        self.max_words = max_words
+        self.parse_min_words = parse_min_words
+        self._pending = ""  # carried-over segment, already parsed once
+        self._unparsed = []  # chunks waiting for enough words to parse
+        self.chunks = 0
+        self.tokens_parsed = 0
+
+    @property
+    def pending_words(self) -> int:
+        """Words fed but not returned in a segment yet."""
+        return len(self._pending.split()) + sum(len(c.split()) for c in self._unparsed)
+
+    def _segments(self, doc) -> List[str]:
+        segments = []
+        start = 0
+        words = 0
+        for token in doc:
+            boundary = token.i > start and (
+                token.is_sent_start
+                or (token.lower_ in self.split_words and token.dep_ in SPLIT_DEPS
+                    and words >= self.min_words)
+                or words >= self.max_words
+            )
+            if boundary:
+                segments.append(doc[start:token.i].text)
+                start = token.i
+                words = 0
+            # Clitics like "n't" and "'s" are attached to the previous token
+            if not token.is_punct and (token.i == start or doc[token.i - 1].whitespace_):
+                words += 1
+        if start < len(doc):
+            segments.append(doc[start:].text)
+        return segments
+
+    def _parse(self) -> List[str]:
+        text = " ".join([self._pending] + self._unparsed).strip()
+        self._unparsed = []
+        if not text:
+            return []
+        doc = self.nlp(text)
+        self.chunks += 1
+        self.tokens_parsed += len(doc)
+        segments = self._segments(doc)
+        # The last segment may continue in the next chunk
+        self._pending = segments.pop()
+        return segments
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a chunk of the stream and return the segments it completed."""
+        if chunk.strip():
+            self._unparsed.append(" ".join(chunk.split()))
+        if sum(len(c.split()) for c in self._unparsed) < self.parse_min_words:
+            return []
+        return self._parse()
+
+    def flush(self) -> List[str]:
+        """Return everything still buffered, ending the stream."""
+        segments = self._parse() if self._unparsed else []
+        pending, self._pending = self._pending, ""
+        return segments + ([pending] if pending else [])
+
+    def segment(self, text: str) -> List[str]:
+        """Segment a complete text at once."""
+        return self._segments(self.nlp(" ".join(text.split())))
+
+    def segment_many(self, texts: Iterable[str], batch_size: int = 64,
+                     n_process: Optional[int] = None) -> List[List[str]]:
+        """Segment many complete texts, batching them through `nlp.pipe`."""
+        cleaned = (" ".join(text.split()) for text in texts)
+        docs = self.nlp.pipe(cleaned, batch_size=batch_size, n_process=n_process or 1)
+        return [self._segments(doc) for doc in docs]
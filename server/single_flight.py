@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one run.
+
+    The first caller for a key starts the coroutine; callers arriving while it runs
+    await the same task. The shared run is only cancelled once every caller waiting on
+    it has been cancelled, so one impatient caller can't take the result away from
+    the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, List] = {}  # key -> [task, waiters]
+        self.started = 0
+        self.shared = 0
+
+    async def run(self, key: Hashable, make_coro: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(make_coro())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda _: self._calls.pop(key, None) if self._calls.get(key) is call else None)
+            self.started += 1
+        else:
+            self.shared += 1
+        call[1] += 1
+        try:
+            return await asyncio.shield(call[0])
+        finally:
+            call[1] -= 1
+            if call[1] == 0 and not call[0].done():
+                # Drop it now: a caller arriving before the task winds down starts afresh
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call[0].cancel()
+
+    def stats(self) -> Dict:
+        return {
+            "started": self.started,
+            "shared": self.shared,
+            "in_flight": len(self._calls)
+        }
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List
+from urllib.parse import urlparse
+
+
+class DomainRateLimiter:
+    """Spaces out requests to the same domain by at least `min_interval` seconds."""
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, domain: str) -> float:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # Reserve the next free slot for this domain before sleeping so concurrent
+        # callers queue up behind each other instead of all waking at once
+        slot = max(now, self._next_slot.get(domain, 0.0))
+        self._next_slot[domain] = slot + self.min_interval
+        if len(self._next_slot) > 1024:
+            self._next_slot = {d: t for d, t in self._next_slot.items() if t > now}
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class SourceFetcher:
+    """Fetches source pages concurrently under a global limit and per-domain politeness.
+
+    One instance is shared by every check in the process, so the limits hold across
+    concurrent requests and not only within one.
+    """
+
+    def __init__(self, fetch: Callable[[str], Awaitable[str]], max_concurrency: int = 5,
+                 per_domain_interval: float = 1.0):
+        self._fetch = fetch
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = DomainRateLimiter(per_domain_interval)
+
+    async def fetch(self, url: str) -> Dict:
+        domain = urlparse(url).netloc
+        queued_at = time.perf_counter()
+        # Wait for the domain slot before taking a concurrency slot, so a throttled
+        # domain does not hold up fetches to other hosts
+        await self.rate_limiter.wait(domain)
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            content = await self._fetch(url)
+            finished_at = time.perf_counter()
+        return {
+            "url": url,
+            "domain": domain,
+            "content": content,
+            "wait_time": round(started_at - queued_at, 3),
+            "fetch_time": round(finished_at - started_at, 3)
+        }
+
+    async def fetch_until(self, urls: Iterable[str], wanted: int,
+                          is_useful: Callable[[str], bool]) -> List[Dict]:
+        """Fetch `urls` concurrently, stopping once `wanted` of them returned useful content.
+
+        Fetches still running at that point are cancelled and reported with `cancelled` set.
+        """
+        launched_at = time.perf_counter()
+        tasks = {asyncio.ensure_future(self.fetch(url)): url for url in urls}
+        pending = set(tasks)
+        fetches = []
+        useful = 0
+        try:
+            while pending and useful < wanted:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    fetch = task.result()
+                    fetch["cancelled"] = False
+                    if is_useful(fetch["content"]):
+                        useful += 1
+                    fetches.append(fetch)
+        finally:
+            for task in pending:
+                task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            elapsed = round(time.perf_counter() - launched_at, 3)
+            for task in pending:
+                url = tasks[task]
+                fetches.append({
+                    "url": url,
+                    "domain": urlparse(url).netloc,
+                    "content": "",
+                    "wait_time": 0.0,
+                    "fetch_time": elapsed,
+                    "cancelled": True
+                })
+        return fetches
+
+
+def format_fetch_timings(timings: List[Dict]) -> str:
+    lines = ["Fetch timings:"]
+    for t in timings:
+        status = "cancelled" if t["cancelled"] else "ok" if t["ok"] else "no content"
+        lines.append(f"- {t['url']}: waited {t['wait_time']:.2f}s, fetched in {t['fetch_time']:.2f}s ({status})")
+    return "\n".join(lines)
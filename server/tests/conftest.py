@@ -0,0 +1,18 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# The server modules import each other as top-level modules
+sys.path.insert(0, SERVER_DIR)
+
+
+@pytest.fixture(scope="session")
+def server():
+    """The fact-checking server module (its file name is not importable as is)."""
+    spec = importlib.util.spec_from_file_location("factcheck_server", os.path.join(SERVER_DIR, "duckduckgo ollama server.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+from broadcast_hub import SLOW_CONSUMER_CLOSE_CODE, BroadcastHub
+
+
+class FakeWebSocket:
+    def __init__(self, stalled: bool = False):
+        self.sent = []
+        self.close_code = None
+        self.stalled = stalled
+
+    async def send_text(self, text):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def settle():
+    # Let the sender tasks drain their queues
+    await asyncio.sleep(0.01)
+
+
+def test_client_stuck_behind_a_full_queue_is_evicted():
+    async def main():
+        hub = BroadcastHub(max_queue=4)
+        fast, slow = FakeWebSocket(), FakeWebSocket(stalled=True)
+        for websocket in (fast, slow):
+            hub.subscribe(hub.connect(websocket), "session")
+
+        for i in range(10):
+            hub.broadcast({"n": i}, topic="session")
+            await settle()
+
+        assert [message["n"] for message in fast.sent] == list(range(10))
+        assert slow.close_code == SLOW_CONSUMER_CLOSE_CODE
+        assert hub.stats()["disconnects"] == {"queue full": 1}
+        assert len(hub) == 1
+
+    asyncio.run(main())
+
+
+def test_stalled_send_times_out():
+    async def main():
+        hub = BroadcastHub(send_timeout=0.05)
+        slow = FakeWebSocket(stalled=True)
+        hub.subscribe(hub.connect(slow), "session")
+
+        hub.broadcast({"n": 0}, topic="session")
+        await asyncio.sleep(0.1)
+
+        assert slow.close_code == SLOW_CONSUMER_CLOSE_CODE
+        assert hub.stats()["disconnects"] == {"send timed out": 1}
+
+    asyncio.run(main())
+
+
+def test_partial_updates_are_dropped_before_evicting():
+    async def main():
+        hub = BroadcastHub(max_queue=4)
+        slow = FakeWebSocket(stalled=True)
+        hub.subscribe(hub.connect(slow), "session")
+
+        for i in range(10):
+            hub.broadcast({"partial": i}, topic="session", droppable=True)
+            await settle()
+
+        assert slow.close_code is None
+        assert len(hub) == 1
+        assert hub.stats()["dropped"] > 0
+
+    asyncio.run(main())
+
+
+def test_late_subscriber_gets_the_topic_backlog():
+    async def main():
+        hub = BroadcastHub()
+        hub.broadcast({"n": 0}, topic="session")
+        hub.broadcast({"partial": 1}, topic="session", droppable=True)
+        hub.broadcast({"n": 2}, topic="session")
+        hub.broadcast({"n": 3}, topic="other")
+
+        late = FakeWebSocket()
+        client = hub.connect(late)
+        assert hub.subscribe(client, "session") == 2
+        hub.broadcast({"n": 4}, topic="session")
+        await settle()
+
+        # Partial updates are superseded, so only final messages are replayed
+        assert late.sent == [{"n": 0}, {"n": 2}, {"n": 4}]
+
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+import spacy
+
+from caption_sessions import CaptionSession
+
+
+def test_spans_follow_segmenter_boundaries_across_captures():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    session = CaptionSession(min_words=4, pause_seconds=60, nlp=nlp)
+
+    spans = session.ingest("the unemployment rate fell to four percent last year. "
+                           "inflation rose by two points in the same period. the")["spans"]
+    spans += session.ingest("budget deficit doubled since then", final=True)["spans"]
+
+    assert spans == ["the unemployment rate fell to four percent last year.",
+                     "inflation rose by two points in the same period.",
+                     "the budget deficit doubled since then"]
+    assert session.stats()["pending_words"] == 0
+
+
+def test_scrolling_captures_only_add_new_words():
+    session = CaptionSession(min_words=4, pause_seconds=60)
+
+    first = session.ingest("the unemployment rate fell to four percent")
+    second = session.ingest("fell to four percent last year. inflation rose")
+    third = session.ingest("last year. inflation rose by two points.")
+
+    assert first["spans"] == []
+    assert second["spans"] == ["the unemployment rate fell to four percent last year."]
+    assert third["spans"] == ["inflation rose by two points."]
+    stats = session.stats()
+    assert stats["words_received"] == 22
+    assert stats["words_appended"] == 14
+
+
+def test_repeated_claim_is_dropped():
+    session = CaptionSession(min_words=4, pause_seconds=60)
+    claim = "the unemployment rate fell to four percent last year."
+
+    assert session.ingest(claim)["spans"] == [claim]
+    # Said again later, after other text scrolled the first mention away
+    session.ingest("now for something else entirely.")
+    repeated = session.ingest("again, the unemployment rate fell to four percent last year.")
+
+    assert repeated["spans"] == []
+    assert repeated["dropped"] == ["again, the unemployment rate fell to four percent last year."]
+    assert session.stats()["spans_dropped"] == 1
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from jobs import JobQueue, QueueFullError
+
+
+def test_jobs_run_in_priority_order():
+    async def main():
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(statement, options):
+            handled.append(statement)
+            if statement == "first":
+                await release.wait()
+            return {"statement": statement}
+
+        jobs = JobQueue(handler, workers=1)
+        jobs.start()
+        jobs.submit("first", "background")
+        await asyncio.sleep(0)
+        low = jobs.submit("low", "low")
+        background = jobs.submit("background", "background")
+        interactive = jobs.submit("interactive", "interactive")
+
+        assert [jobs.position(job) for job in (interactive, background, low)] == [0, 1, 2]
+        release.set()
+        await asyncio.sleep(0.01)
+        await jobs.stop()
+
+        assert handled == ["first", "interactive", "background", "low"]
+        assert jobs.get(low["id"])["status"] == "done"
+
+    asyncio.run(main())
+
+
+def test_full_queue_rejects_with_retry_hint():
+    async def main():
+        release = asyncio.Event()
+
+        async def handler(statement, options):
+            await release.wait()
+            return {}
+
+        jobs = JobQueue(handler, workers=1, max_queued=2)
+        jobs.start()
+        jobs.submit("running")
+        await asyncio.sleep(0)
+        jobs.submit("queued 1")
+        jobs.submit("queued 2")
+
+        with pytest.raises(QueueFullError) as error:
+            jobs.submit("rejected", "interactive")
+        assert error.value.retry_after >= 1
+        assert jobs.stats()["rejected"] == 1
+
+        release.set()
+        await jobs.stop()
+
+    asyncio.run(main())
+
+
+def test_unknown_priority_is_refused():
+    async def main():
+        jobs = JobQueue(lambda statement, options: None)
+        jobs.start()
+        with pytest.raises(ValueError):
+            jobs.submit("statement", "urgent")
+        await jobs.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from source_fetcher import SourceFetcher
+
+SLOW_SITE = "https://slow.example.com/story"
+PAGE = "The claim was checked against the official figures published last year. " * 5
+
+
+def make_checker(server, tmp_path):
+    checker = server.OllamaFactChecker(parse_workers=0, evidence_index_path=str(tmp_path / "index"),
+                                       per_domain_interval=0)
+    searches = []
+    fetched = []
+
+    async def search(query, max_results):
+        searches.append(query)
+        slug = abs(hash(query)) % 10000
+        return [{"href": f"https://site{i}-{slug}.example.com/", "title": query} for i in range(max_results)]
+
+    async def fetch(url):
+        fetched.append(url)
+        await asyncio.sleep(2.0 if url == SLOW_SITE else 0.01)
+        return PAGE
+
+    async def summarize(statement, content, embeddings=None):
+        return content
+
+    async def index_evidence(*args):
+        pass
+
+    async def finish(statement, sources_data, fetch_timings, embeddings=None, on_update=None):
+        return {"sources": sources_data, "timings": fetch_timings}
+
+    checker._search = search
+    checker.source_fetcher = SourceFetcher(fetch, max_concurrency=10, per_domain_interval=0)
+    checker.summarize_content = summarize
+    checker._index_evidence = index_evidence
+    checker._finish_analysis = finish
+    return checker, searches, fetched
+
+
+def initial_results():
+    # What the two initial searches return: as many candidates as sources wanted
+    return [{"href": SLOW_SITE, "title": "slow"}] + [
+        {"href": f"https://fast{i}.example.com/", "title": "fast"} for i in range(4)
+    ]
+
+
+def test_hedged_first_wave_cancels_slow_site(server, tmp_path):
+    checker, searches, fetched = make_checker(server, tmp_path)
+
+    started_at = time.perf_counter()
+    result = asyncio.run(checker._analyze_sources("a claim", initial_results(), overfetch_factor=2.0))
+    elapsed = time.perf_counter() - started_at
+
+    assert len(result["sources"]) == 5
+    assert SLOW_SITE not in {source["url"] for source in result["sources"]}
+    # Spare candidates were searched for before the first wave, and fetched in it
+    assert searches
+    assert len(fetched) > 5
+    assert any(t["cancelled"] and t["url"] == SLOW_SITE for t in result["timings"])
+    assert elapsed < 1.5
+
+
+def test_no_overfetch_fetches_only_initial_candidates(server, tmp_path):
+    checker, searches, fetched = make_checker(server, tmp_path)
+
+    result = asyncio.run(checker._analyze_sources("a claim", initial_results(), overfetch_factor=1.0))
+
+    assert searches == []
+    assert len(fetched) == 5
+    assert len(result["sources"]) == 5
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_caller_after_last_waiter_cancelled_starts_a_new_run():
+    async def main():
+        flight = SingleFlight()
+        runs = []
+
+        async def work(n):
+            runs.append(n)
+            try:
+                await asyncio.sleep(0.05)
+            finally:
+                # Winding down takes a moment after the cancellation
+                await asyncio.shield(asyncio.sleep(0.05))
+            return n
+
+        first = asyncio.ensure_future(flight.run("key", lambda: work(1)))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        assert await flight.run("key", lambda: work(2)) == 2
+        assert runs == [1, 2]
+        await asyncio.sleep(0.1)
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_concurrent_callers_share_one_run():
+    async def main():
+        flight = SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.run("key", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert len(runs) == 1
+        assert flight.stats() == {"started": 1, "shared": 4, "in_flight": 0}
+
+    asyncio.run(main())
+
+
+def test_run_survives_until_the_last_caller_is_cancelled():
+    async def main():
+        flight = SingleFlight()
+        cancelled = []
+
+        async def work():
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return "result"
+
+        impatient = asyncio.ensure_future(flight.run("key", work))
+        patient = asyncio.ensure_future(flight.run("key", work))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+
+        assert await patient == "result"
+        assert impatient.cancelled()
+        assert cancelled == []
+
+        last = asyncio.ensure_future(flight.run("other", work))
+        await asyncio.sleep(0.01)
+        last.cancel()
+        await asyncio.sleep(0.01)
+        assert cancelled == [True]
+
+    asyncio.run(main())
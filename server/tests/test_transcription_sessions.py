@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from transcription_sessions import SAMPLE_RATE, TranscriptionSession
+
+
+def stream(audio, chunk=1600):
+    durations = []
+    session = TranscriptionSession(lambda segment, prompt: durations.append(len(segment) / SAMPLE_RATE) or "text")
+    for i in range(0, len(audio), chunk):
+        session.append(audio[i:i + chunk])
+    session.append(np.zeros(0, dtype=np.float32), final=True)
+    return durations
+
+
+@pytest.mark.parametrize("rms", [0.005, 0.05])
+def test_noisy_start_opens_no_segment(rms):
+    noise = np.random.default_rng(0).standard_normal(5 * SAMPLE_RATE) * rms
+    assert stream(noise.astype(np.float32)) == []
+
+
+def test_speech_at_the_very_start_is_kept():
+    t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+    speech = 0.2 * np.sin(2 * np.pi * 200 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)) ** 2
+    audio = np.concatenate([speech, np.zeros(SAMPLE_RATE)])
+    audio += np.random.default_rng(0).standard_normal(len(audio)) * 0.002
+    durations = stream(audio.astype(np.float32))
+    assert len(durations) == 1
+    assert durations[0] >= 2.0
@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+class TranscriptionSession:
+    """Rolling audio buffer for one live stream, transcribed segment by segment.
+
+    Appended 16 kHz mono samples go through an energy voice-activity detector on
+    `frame_ms` frames. A frame counts as speech when it is `speech_ratio` times
+    louder than the noise floor. The floor starts at the `floor_percentile` quietest
+    frames of the first `startup_ms`; nothing is classified until that much audio
+    arrived, so a stream that starts noisy does not open a segment on the noise.
+    After that the floor drops at once to any quieter frame and rises by
+    `floor_rise` per frame only on non-speech frames outside a segment, so talking
+    never lifts it. If the background itself gets louder, so that even the `floor_percentile` quietest
+    frames of the last `floor_window_seconds` count as speech, the floor jumps to
+    that level. A segment ends after `min_silence_ms` of silence, or at the quietest
+    frame near `max_segment_seconds` when nobody pauses. Only then is it
+    transcribed, once, with the end of the transcript so far as the prompt, so text
+    is emitted only when it is stable and no audio is transcribed twice. Silence
+    between segments is dropped without transcribing it.
+    """
+
+    def __init__(self, transcribe: Callable[[np.ndarray, str], str], frame_ms: int = 30,
+                 min_silence_ms: int = 500, min_speech_ms: int = 250, pad_ms: int = 150,
+                 max_segment_seconds: float = 20.0, speech_ratio: float = 3.0, min_energy: float = 1e-3,
+                 floor_rise: float = 0.02, floor_window_seconds: float = 60.0, floor_percentile: float = 5.0,
+                 startup_ms: int = 500, prompt_chars: int = 200):
+        self.transcribe = transcribe
+        self.frame = SAMPLE_RATE * frame_ms // 1000
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.pad_frames = pad_ms // frame_ms
+        self.max_segment_frames = int(max_segment_seconds * 1000) // frame_ms
+        self.speech_ratio = speech_ratio
+        self.min_energy = min_energy
+        self.floor_rise = floor_rise
+        self.floor_percentile = floor_percentile
+        self.startup_frames = max(1, startup_ms // frame_ms)
+        self._window = deque(maxlen=int(floor_window_seconds * 1000) // frame_ms)  # recent RMS, for the floor
+        self.prompt_chars = prompt_chars
+        self.lock = threading.Lock()
+        self.last_seen = time.time()
+        self.transcript = ""
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._frames = 0          # complete frames in the buffer that went through the VAD
+        self._energy: List[float] = []  # RMS per analysed frame
+        self._noise_floor = min_energy
+        self._floor_settled = False  # measured from the start of the stream
+        self._start: Optional[int] = None  # first frame of the open segment
+        self._last_speech = 0
+        self.audio_seconds = 0.0
+        self.transcribed_seconds = 0.0
+        self.transcribe_time = 0.0
+        self.segments = 0
+
+    def _threshold(self) -> float:
+        return max(self.min_energy, self._noise_floor * self.speech_ratio)
+
+    def _is_speech(self, energy: float) -> bool:
+        self._window.append(energy)
+        # Pauses pull the floor down to the background at once
+        self._noise_floor = max(1e-5, min(energy, self._noise_floor))
+        if energy <= self._threshold():
+            # ...but only the quiet between utterances lifts it, slowly: quiet
+            # syllables inside a segment (e.g. in a noisy room) must not
+            if self._start is None:
+                self._noise_floor = min(energy, self._noise_floor * (1 + self.floor_rise))
+            return False
+        if len(self._window) == self._window.maxlen:
+            # Nothing in the window is quiet: the background got louder, not the talking
+            quietest = float(np.percentile(self._window, self.floor_percentile))
+            if quietest > self._threshold():
+                self._noise_floor = quietest
+                return energy > self._threshold()
+        return True
+
+    def _cut(self, end: int, segments: List[np.ndarray]):
+        """Close the open segment at frame `end` and queue it unless it is too short."""
+        if end - self._start >= self.min_speech_frames:
+            segments.append(self._audio[self._start * self.frame:end * self.frame])
+        self._start = None
+
+    def _settle_floor(self, final: bool) -> bool:
+        """Start the noise floor from the first frames once there are enough of them."""
+        frames = min(len(self._audio) // self.frame, self.startup_frames)
+        if frames == 0 or (frames < self.startup_frames and not final):
+            return False
+        start = self._audio[:frames * self.frame].reshape(frames, self.frame)
+        energy = np.sqrt(np.mean(start * start, axis=1))
+        self._noise_floor = max(1e-5, float(np.percentile(energy, self.floor_percentile)))
+        self._floor_settled = True
+        return True
+
+    def _analyse(self, segments: List[np.ndarray], final: bool = False):
+        # Until the floor is known the audio is kept unanalysed (`_trim` keeps it all)
+        if not self._floor_settled and not self._settle_floor(final):
+            return
+        while (self._frames + 1) * self.frame <= len(self._audio):
+            i = self._frames
+            frame = self._audio[i * self.frame:(i + 1) * self.frame]
+            energy = float(np.sqrt(np.mean(frame * frame)))
+            self._energy.append(energy)
+            self._frames += 1
+
+            if self._is_speech(energy):
+                if self._start is None:
+                    self._start = max(0, i - self.pad_frames)
+                self._last_speech = i
+            elif self._start is not None and i - self._last_speech >= self.min_silence_frames:
+                self._cut(min(self._last_speech + 1 + self.pad_frames, self._frames), segments)
+
+            if self._start is not None and self._frames - self._start >= self.max_segment_frames:
+                # No pause: split at the quietest frame of the last quarter of the segment
+                search_from = self._start + 3 * self.max_segment_frames // 4
+                end = search_from + int(np.argmin(self._energy[search_from:self._frames])) + 1
+                start = end
+                self._cut(end, segments)
+                self._start = start
+
+    def _trim(self):
+        """Drop audio no open segment can still need."""
+        keep = self._start if self._start is not None else max(0, self._frames - self.pad_frames)
+        if keep:
+            self._audio = self._audio[keep * self.frame:]
+            self._energy = self._energy[keep:]
+            self._frames -= keep
+            self._last_speech -= keep
+            if self._start is not None:
+                self._start -= keep
+
+    def _transcribe(self, segments: List[np.ndarray]) -> List[str]:
+        texts = []
+        for segment in segments:
+            started_at = time.perf_counter()
+            text = self.transcribe(segment, self.transcript[-self.prompt_chars:]).strip()
+            self.transcribe_time += time.perf_counter() - started_at
+            self.transcribed_seconds += len(segment) / SAMPLE_RATE
+            self.segments += 1
+            if text:
+                texts.append(text)
+                self.transcript = f"{self.transcript} {text}".strip()
+        return texts
+
+    def append(self, samples: np.ndarray, final: bool = False) -> List[str]:
+        """Add audio and return the text of every segment it completed."""
+        self.last_seen = time.time()
+        samples = np.asarray(samples, dtype=np.float32)
+        self.audio_seconds += len(samples) / SAMPLE_RATE
+        self._audio = np.concatenate([self._audio, samples]) if len(self._audio) else samples
+        segments = []
+        self._analyse(segments, final)
+        if final and self._start is not None:
+            self._cut(self._frames, segments)
+        self._trim()
+        return self._transcribe(segments)
+
+    def stats(self) -> Dict:
+        return {
+            "audio_seconds": round(self.audio_seconds, 2),
+            "transcribed_seconds": round(self.transcribed_seconds, 2),
+            "buffered_seconds": round(len(self._audio) / SAMPLE_RATE, 2),
+            "segments": self.segments,
+            "real_time_factor": self.transcribe_time / self.audio_seconds if self.audio_seconds else 0.0
+        }
+
+
+class TranscriptionSessions:
+    """Streaming sessions by id; sessions idle for `session_ttl` seconds are dropped."""
+
+    def __init__(self, transcribe: Callable[[np.ndarray, str], str], session_ttl: float = 300,
+                 max_sessions: int = 100, **session_options):
+        self.transcribe = transcribe
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self.session_options = session_options
+        self._sessions: "OrderedDict[str, TranscriptionSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self):
+        cutoff = time.time() - self.session_ttl
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_seen >= cutoff and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+
+    def get(self, session_id: str) -> TranscriptionSession:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = TranscriptionSession(self.transcribe, **self.session_options)
+            self._sessions.move_to_end(session_id)
+            self._prune()
+            return session
+
+    def pop(self, session_id: str) -> Optional[TranscriptionSession]:
+        with self._lock:
+            return self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            sessions = list(self._sessions.items())
+        return {session_id: session.stats() for session_id, session in sessions}
@@ -0,0 +1,119 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse case and whitespace so trivially different captions share a key."""
+    return re.sub(r'\s+', ' ', statement).strip().lower()
+
+
+NUMBER_WORDS = {
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "twenty", "thirty", "forty", "fifty", "hundred", "thousand", "million",
+    "billion", "trillion", "half", "double", "twice", "triple"
+}
+NEGATIONS = {"not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "cannot", "without"}
+
+
+def claim_signature(statement: str) -> Tuple[Tuple[str, ...], int]:
+    """The numbers and the number of negations in a statement.
+
+    Embeddings barely move when only a figure or a "not" changes, but the verdict
+    does, so cached verdicts are only reused for statements with the same signature.
+    """
+    text = normalize_statement(statement).replace("\u2019", "'")
+    # "4,000" and "4000" are the same figure
+    numbers = re.findall(r'\d+(?:\.\d+)?', re.sub(r'(?<=\d),(?=\d{3})', '', text))
+    words = re.findall(r"[a-z]+(?:'[a-z]+)?", text)
+    numbers += [word for word in words if word in NUMBER_WORDS]
+    negations = sum(word in NEGATIONS or word.endswith("n't") for word in words)
+    return tuple(sorted(numbers)), negations
+
+
+class VerdictCache:
+    """Caches fact-check verdicts by statement embedding.
+
+    A lookup hits when a stored statement's embedding has cosine similarity of at least
+    `similarity_threshold` with the query and both statements have the same numbers
+    and number of negations (see `claim_signature`). Entries expire after `ttl` seconds and the
+    least recently used one is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.92, max_entries: int = 1024, ttl: float = 3600):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Embeddings live in a fixed matrix so a lookup is a single matrix-vector product
+        self._embeddings: Optional[np.ndarray] = None
+        self._valid = np.zeros(max_entries, dtype=bool)
+        # slot -> (result, stored_at, claim signature), LRU first
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def _remove(self, slot: int):
+        del self._entries[slot]
+        self._valid[slot] = False
+        self._free_slots.append(slot)
+
+    def _evict_expired(self):
+        cutoff = time.monotonic() - self.ttl
+        expired = [slot for slot, (_, stored_at, _) in self._entries.items() if stored_at < cutoff]
+        for slot in expired:
+            self._remove(slot)
+
+    def get(self, embedding: np.ndarray, statement: str) -> Optional[Dict]:
+        self._evict_expired()
+        if not self._entries:
+            self.misses += 1
+            return None
+
+        similarities = self._embeddings @ self._normalize(embedding)
+        similarities[~self._valid] = -np.inf
+        candidates = np.flatnonzero(similarities >= self.similarity_threshold)
+        signature = claim_signature(statement)
+        # Most similar first; near-duplicates with another figure or negation don't count
+        for slot in candidates[np.argsort(-similarities[candidates])]:
+            slot = int(slot)
+            if self._entries[slot][2] == signature:
+                self.hits += 1
+                self._entries.move_to_end(slot)
+                return self._entries[slot][0]
+
+        self.misses += 1
+        return None
+
+    def put(self, embedding: np.ndarray, result: Dict, statement: str):
+        embedding = self._normalize(embedding)
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.float32)
+
+        self._evict_expired()
+        if not self._free_slots:
+            lru_slot = next(iter(self._entries))
+            self._remove(lru_slot)
+
+        slot = self._free_slots.pop()
+        self._embeddings[slot] = embedding
+        self._valid[slot] = True
+        self._entries[slot] = (result, time.monotonic(), claim_signature(statement))
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,210 @@
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+import whisper
+
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 30 * SAMPLE_RATE  # Whisper decodes at most 30 s at a time
+
+
+class WhisperBatchWorker:
+    """Runs Whisper for every request thread on one inference thread, in batches.
+
+    Callers queue audio with `transcribe` and block on the result. The worker takes
+    whatever is queued (up to `max_batch_size` 30 s windows, waiting at most
+    `max_wait` seconds for more to arrive), computes the log-mel spectrograms, and runs
+    the encoder once for the whole batch. The decoder is then run on the precomputed
+    audio features, batched per distinct prompt since Whisper decodes a batch with a
+    single prompt. Only this thread touches the model, so concurrent requests no
+    longer share it unsafely.
+
+    Unlike `model.transcribe`, each window is decoded once at temperature 0 without
+    the fallback retries. Audio longer than one window (whole uploads) is instead
+    transcribed with `model.transcribe` on the same thread, outside the batches, so
+    it keeps the prompt from window to window and the temperature fallback. With
+    `language` None (the default) the language is detected for each window, as
+    `model.transcribe` does for its first one; English-only models always decode
+    English.
+    """
+
+    def __init__(self, model, max_batch_size: int = 8, max_wait: float = 0.05, language: Optional[str] = None,
+                 fp16: bool = False):
+        if language is None and not model.is_multilingual:
+            language = "en"
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.options = dict(language=language, fp16=fp16, without_timestamps=True)
+        self._queue: "queue.Queue[Dict]" = queue.Queue()
+        self.batches = 0
+        self.windows = 0
+        self.peak_queue_depth = 0
+        self._batch_sizes = deque(maxlen=500)
+        self._batch_latencies = deque(maxlen=500)
+        self._queue_waits = deque(maxlen=500)
+        self._thread = threading.Thread(target=self._run, name="whisper-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, audio: np.ndarray, prompt: str = "") -> Future:
+        """Queue audio (one window of at most 30 s is batched); the future resolves to its text."""
+        future = Future()
+        self._queue.put({"audio": audio, "prompt": prompt, "future": future, "queued_at": time.perf_counter()})
+        self.peak_queue_depth = max(self.peak_queue_depth, self._queue.qsize())
+        return future
+
+    def transcribe(self, audio: np.ndarray, prompt: str = "") -> str:
+        """Transcribe audio of any length, blocking until the worker has processed it."""
+        return self.submit(audio, prompt).result().strip()
+
+    def _collect(self) -> List[Dict]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started_at = time.perf_counter()
+            for item in batch:
+                self._queue_waits.append(started_at - item["queued_at"])
+            windows = [item for item in batch if len(item["audio"]) <= WINDOW_SAMPLES]
+            if windows:
+                self._resolve(windows, self._infer)
+            for item in batch:
+                if len(item["audio"]) > WINDOW_SAMPLES:
+                    self._resolve([item], self._transcribe_long)
+            self.batches += 1
+            self.windows += len(batch)
+            self._batch_sizes.append(len(batch))
+            self._batch_latencies.append(time.perf_counter() - started_at)
+
+    @staticmethod
+    def _resolve(items: List[Dict], infer: Callable[[List[Dict]], List[str]]):
+        try:
+            texts = infer(items)
+        except Exception as e:
+            for item in items:
+                item["future"].set_exception(e)
+        else:
+            for item, text in zip(items, texts):
+                item["future"].set_result(text)
+
+    def _transcribe_long(self, items: List[Dict]) -> List[str]:
+        item = items[0]
+        result = self.model.transcribe(
+            torch.from_numpy(np.ascontiguousarray(item["audio"], dtype=np.float32)),
+            language=self.options["language"], fp16=self.options["fp16"], initial_prompt=item["prompt"] or None
+        )
+        return [result["text"]]
+
+    def _infer(self, batch: List[Dict]) -> List[str]:
+        device = self.model.device
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(torch.from_numpy(np.ascontiguousarray(item["audio"], dtype=np.float32))),
+                n_mels=self.model.dims.n_mels
+            )
+            for item in batch
+        ]).to(device)
+        if self.options["fp16"]:
+            mels = mels.half()
+
+        texts: List[Optional[str]] = [None] * len(batch)
+        with torch.no_grad():
+            features = self.model.embed_audio(mels)
+            groups: Dict[str, List[int]] = {}
+            for i, item in enumerate(batch):
+                groups.setdefault(item["prompt"], []).append(i)
+            for prompt, indices in groups.items():
+                options = whisper.DecodingOptions(prompt=prompt or None, **self.options)
+                results = whisper.decode(self.model, features[indices], options)
+                for i, result in zip(indices, results):
+                    texts[i] = result.text
+        return texts
+
+    def stats(self) -> Dict:
+        sizes = list(self._batch_sizes)
+        latencies = sorted(self._batch_latencies)
+        waits = list(self._queue_waits)
+        return {
+            "queue_depth": self._queue.qsize(),
+            "peak_queue_depth": self.peak_queue_depth,
+            "batches": self.batches,
+            "windows": self.windows,
+            "mean_batch_size": sum(sizes) / len(sizes) if sizes else 0.0,
+            "mean_batch_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_batch_ms": 1000 * latencies[math.ceil(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "mean_queue_wait_ms": 1000 * sum(waits) / len(waits) if waits else 0.0
+        }
+
+
+class FasterWhisperWorker:
+    """The WhisperBatchWorker interface for a faster-whisper (CTranslate2) model.
+
+    CTranslate2 releases the GIL and runs up to the model's `num_workers`
+    transcriptions in parallel on its own threads, so requests call it directly; a
+    semaphore bounds concurrency to that and lets `stats` report the same queueing
+    figures as the batch worker. Decoding is greedy at temperature 0, as there, and
+    with `language` None faster-whisper detects the language of each request.
+    """
+
+    def __init__(self, model, language: Optional[str] = None, max_concurrency: int = 2):
+        self.model = model
+        self.language = language
+        self._slots = threading.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.peak_queue_depth = 0
+        self.requests = 0
+        self._latencies = deque(maxlen=500)
+        self._queue_waits = deque(maxlen=500)
+
+    def transcribe(self, audio: np.ndarray, prompt: str = "") -> str:
+        queued_at = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self._waiting)
+        with self._slots:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._waiting -= 1
+            segments, _ = self.model.transcribe(
+                np.ascontiguousarray(audio, dtype=np.float32), language=self.language,
+                initial_prompt=prompt or None, beam_size=1, temperature=0.0,
+                condition_on_previous_text=False, without_timestamps=True
+            )
+            # Segments are produced lazily while iterating
+            text = " ".join(segment.text.strip() for segment in segments)
+            finished_at = time.perf_counter()
+        with self._lock:
+            self.requests += 1
+            self._queue_waits.append(started_at - queued_at)
+            self._latencies.append(finished_at - started_at)
+        return text.strip()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waits = list(self._queue_waits)
+            waiting = self._waiting
+        return {
+            "queue_depth": waiting,
+            "peak_queue_depth": self.peak_queue_depth,
+            "requests": self.requests,
+            "mean_request_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_request_ms": 1000 * latencies[math.ceil(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "mean_queue_wait_ms": 1000 * sum(waits) / len(waits) if waits else 0.0
+        }